@@ -0,0 +1,173 @@
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from data_loader import load_artwork_data
+from event_log import (
+    AnswerEventLog,
+    AnswerStats,
+    DIMENSIONS,
+    LOG_MAGIC,
+    OUTCOME_NAMES,
+    RECORD_DTYPE,
+    report,
+)
+from game import QUESTION_CLASSES
+from bitmap_index import QuizFilter
+from quiz_index import QuizIndex
+from scheduler import ReviewScheduler
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def write_synthetic_log(path: Path, events: int, seed: int = 0):
+    """
+    Writes a log with random events plus a matching key table, without going through record().
+    """
+    rng = np.random.default_rng(seed)
+    key_counts = {"question": 4, "artist": 2000, "style": 6, "category": 40, "decade": 60}
+    with open(path.with_suffix(path.suffix + ".keys"), "w", encoding="utf-8") as fh:
+        for dim in DIMENSIONS:
+            for i in range(key_counts[dim]):
+                fh.write(f"{dim}\t{dim}-{i}\n")
+    with open(path, "wb") as fh:
+        fh.write(LOG_MAGIC)
+        chunk = 1_000_000
+        for start in range(0, events, chunk):
+            n = min(chunk, events - start)
+            records = np.zeros(n, dtype=RECORD_DTYPE)
+            records["timestamp"] = time.time()
+            for dim in DIMENSIONS:
+                records[dim] = rng.integers(0, key_counts[dim], n)
+            records["outcome"] = rng.integers(0, len(OUTCOME_NAMES), n)
+            records.tofile(fh)
+
+
+def bench_event_log(events: int):
+    print(f"\n== Answer event log ({events:,} events) ==")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "answer_events.log"
+        _, elapsed = _timed(write_synthetic_log, path, events)
+        print(f"write synthetic log:        {elapsed:8.3f} s  ({path.stat().st_size / 1e6:.1f} MB)")
+
+        _, elapsed = _timed(AnswerStats.load, path)
+        print(f"full scan (no snapshot):    {elapsed:8.3f} s")
+        _, elapsed = _timed(report, path)
+        print(f"report (writes snapshot):   {elapsed:8.3f} s")
+
+        class _Question:
+            artwork = {"Artist": "artist-1", "Style": "style-1", "Category": "category-1", "Year_decade": 1880.0}
+
+        log = AnswerEventLog(path)
+        appended = 10_000
+        start = time.perf_counter()
+        for _ in range(appended):
+            log.record(_Question(), random.randrange(len(OUTCOME_NAMES)))
+        elapsed = time.perf_counter() - start
+        log.close()
+        print(f"record() per event:         {elapsed / appended * 1e6:8.1f} us")
+        _, elapsed = _timed(AnswerStats.load, path)
+        print(f"incremental load (+{appended:,}):  {elapsed:8.3f} s")
+
+
+def scaled_data(data: pd.DataFrame, rows: int) -> pd.DataFrame:
+    """
+    Repeats the real dataset until it has at least `rows` rows.
+    """
+    copies = max(1, -(-rows // len(data)))
+    return pd.concat([data] * copies, ignore_index=True).iloc[:max(rows, len(data))].reset_index(drop=True)
+
+
+def bench_prepare(data: pd.DataFrame, rounds: int):
+    print(f"\n== Question prepare latency ({len(data):,} rows, {rounds} rounds per class) ==")
+    index, elapsed = _timed(QuizIndex, data)
+    print(f"build QuizIndex:            {elapsed * 1e3:8.1f} ms")
+    for question_class in QUESTION_CLASSES:
+        start = time.perf_counter()
+        prepared = 0
+        for _ in range(rounds):
+            prepared += bool(question_class(data, index).prepare_question())
+        elapsed = time.perf_counter() - start
+        print(f"{question_class.__name__:<27} {elapsed / rounds * 1e6:10.1f} us/question  ({prepared}/{rounds} prepared)")
+
+
+def bench_filters(data: pd.DataFrame, index: QuizIndex = None):
+    print(f"\n== Theme filters ({len(data):,} rows) ==")
+    if index is None:
+        index, elapsed = _timed(QuizIndex, data)
+        print(f"build QuizIndex:            {elapsed * 1e3:8.1f} ms")
+    themes = [
+        QuizFilter(categories=["Impressionism"]),
+        QuizFilter(year_from=1850, year_to=1900),
+        QuizFilter(face_or_body=["face"]),
+        QuizFilter(categories=["Impressionism", "Realism"], face_or_body=["face", "body"], year_from=1850, year_to=1900),
+    ]
+    for quiz_filter in themes:
+        matches, elapsed = _timed(index.apply_filter, quiz_filter)
+        _, pool_elapsed = _timed(index.pool, ["Year_exact"])
+        print(f"{quiz_filter.describe()[:60]:<60} apply {elapsed * 1e3:7.2f} ms, "
+              f"first pool {pool_elapsed * 1e3:6.2f} ms  ({matches:,} rows)")
+    index.apply_filter(QuizFilter())
+
+
+def bench_scheduler(items: int):
+    print(f"\n== Review scheduler ({items:,} tracked items) ==")
+    rng = random.Random(0)
+    type_names = [cls.__name__ for cls in QUESTION_CLASSES]
+    keys = [rng.getrandbits(64) for _ in range(items)]
+    with tempfile.TemporaryDirectory() as tmp:
+        scheduler = ReviewScheduler(Path(tmp) / "player.npz")
+        start = time.perf_counter()
+        for key in keys:
+            scheduler.record(key, rng.choice(type_names), rng.random() < 0.7)
+        elapsed = time.perf_counter() - start
+        print(f"record() new item:          {elapsed / items * 1e6:8.2f} us")
+
+        rounds = 100_000
+        reviewed = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            item = scheduler.next_due()
+            if item is None:
+                item = (rng.choice(keys), rng.choice(type_names))
+            else:
+                reviewed += 1
+            scheduler.record(item[0], item[1], rng.random() < 0.7)
+        elapsed = time.perf_counter() - start
+        print(f"next_due() + record():      {elapsed / rounds * 1e6:8.2f} us  ({reviewed:,}/{rounds:,} were reviews)")
+
+        _, elapsed = _timed(scheduler.save)
+        print(f"save:                       {elapsed * 1e3:8.1f} ms  ({scheduler.path.stat().st_size / 1e6:.1f} MB)")
+        loaded, elapsed = _timed(ReviewScheduler.load, scheduler.path)
+        print(f"load:                       {elapsed * 1e3:8.1f} ms  ({len(loaded):,} items)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Art quiz performance benchmarks.")
+    parser.add_argument("--events", type=int, default=20_000_000, help="Events in the synthetic answer log")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the scaled-up dataset")
+    parser.add_argument("--rounds", type=int, default=50, help="Questions prepared per class")
+    parser.add_argument("--review-items", type=int, default=100_000, help="Items tracked by the review scheduler")
+    args = parser.parse_args()
+    bench_event_log(args.events)
+
+    data = load_artwork_data(Path("clean_quiz_core_metadata.tsv"), Path("WikiArt-info.tsv"),
+                             [cls.REQUIRED_COLUMNS for cls in QUESTION_CLASSES])
+    bench_prepare(data, args.rounds)
+    if args.rows > len(data):
+        data = scaled_data(data, args.rows)
+        bench_prepare(data, args.rounds)
+    bench_filters(data)
+    bench_scheduler(args.review_items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+# Columns with one bitmap per value; composite values ('Cubism,Expressionism') set the bit of each part
+VALUE_COLUMNS = ["Category", "Style", "Face_or_body"]
+YEAR_BUCKET_COLUMN = "Year_5yr_group"
+YEAR_BUCKET_SIZE = 5            # Years per group; a group starting at 1850 holds 1850-1854
+YEAR_COLUMN = "Year_exact"      # Checked for the groups that straddle the edge of a year range
+
+
+class QuizFilter:
+    """
+    A player's theme for a game. Within one field any listed value matches; fields are combined with AND.
+    Years match when the artwork's exact year is within [year_from, year_to], both inclusive.
+    """
+    def __init__(self, categories: Iterable[str] = (), styles: Iterable[str] = (),
+                 face_or_body: Iterable[str] = (), year_from: Optional[int] = None,
+                 year_to: Optional[int] = None):
+        self.categories = [c.strip() for c in categories]
+        self.styles = [s.strip() for s in styles]
+        self.face_or_body = [f.strip().lower() for f in face_or_body]
+        self.year_from = year_from
+        self.year_to = year_to
+
+    def is_empty(self) -> bool:
+        return not (self.categories or self.styles or self.face_or_body
+                    or self.year_from is not None or self.year_to is not None)
+
+    def describe(self) -> str:
+        parts = []
+        if self.categories:
+            parts.append(" or ".join(self.categories))
+        if self.styles:
+            parts.append(" or ".join(self.styles))
+        if self.face_or_body:
+            parts.append("depicting " + " or ".join(self.face_or_body))
+        if self.year_from is not None or self.year_to is not None:
+            parts.append(f"{self.year_from if self.year_from is not None else '…'}–"
+                         f"{self.year_to if self.year_to is not None else '…'}")
+        return ", ".join(parts) if parts else "All artworks"
+
+
+class BitmapIndex:
+    """
+    Packed bitmaps (one bit per dataframe row) per value of the filterable columns and per year bucket.
+    Filters are resolved with bitwise OR/AND over these, without touching the dataframe.
+    """
+    def __init__(self, data: pd.DataFrame):
+        self.num_rows = len(data)
+        self.values: Dict[str, Dict[str, np.ndarray]] = {}
+        for col in VALUE_COLUMNS:
+            if col in data.columns:
+                self.values[col] = self._value_bitmaps(data[col], lower=(col == "Face_or_body"))
+        self.bucket_starts = np.zeros(0)
+        self.bucket_bits: List[np.ndarray] = []
+        if YEAR_BUCKET_COLUMN in data.columns:
+            codes, uniques = pd.factorize(data[YEAR_BUCKET_COLUMN], sort=True)
+            self.bucket_starts = np.asarray(uniques, dtype=float)
+            self.bucket_bits = [self.pack(codes == code) for code in range(len(uniques))]
+        self.years = data[YEAR_COLUMN].to_numpy(dtype=float) if YEAR_COLUMN in data.columns else None
+
+    def _value_bitmaps(self, column: pd.Series, lower: bool) -> Dict[str, np.ndarray]:
+        codes, uniques = pd.factorize(column)
+        masks: Dict[str, np.ndarray] = {}
+        for code, value in enumerate(uniques):
+            for part in str(value).split(","):
+                part = part.strip().lower() if lower else part.strip()
+                if part:
+                    mask = codes == code
+                    masks[part] = masks[part] | mask if part in masks else mask
+        return {value: self.pack(mask) for value, mask in sorted(masks.items())}
+
+    @staticmethod
+    def pack(mask: np.ndarray) -> np.ndarray:
+        return np.packbits(np.asarray(mask, dtype=bool))
+
+    def all_rows(self) -> np.ndarray:
+        return self.pack(np.ones(self.num_rows, dtype=bool))
+
+    def positions(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Returns the row positions whose bit is set.
+        """
+        return np.flatnonzero(np.unpackbits(bits, count=self.num_rows))
+
+    @staticmethod
+    def contains(bits: np.ndarray, position: int) -> bool:
+        return bool(bits[position >> 3] & (0x80 >> (position & 7)))
+
+    def choices(self, column: str) -> List[str]:
+        """
+        Returns the values a filter can use for a column.
+        """
+        return list(self.values.get(column, {}))
+
+    def _any_of(self, column: str, wanted: List[str]) -> np.ndarray:
+        bitmaps = self.values.get(column, {})
+        unknown = [v for v in wanted if v not in bitmaps]
+        if unknown:
+            raise ValueError(f"Unknown {column} value(s): {', '.join(unknown)}")
+        bits = bitmaps[wanted[0]].copy()
+        for value in wanted[1:]:
+            np.bitwise_or(bits, bitmaps[value], out=bits)
+        return bits
+
+    def _year_range(self, year_from: Optional[int], year_to: Optional[int]) -> np.ndarray:
+        """
+        ORs the 5-year groups that lie inside the range; the groups straddling either edge
+        are narrowed with an exact-year comparison, so only years within the range match.
+        """
+        low = -np.inf if year_from is None else year_from
+        high = np.inf if year_to is None else year_to
+        bucket_ends = self.bucket_starts + YEAR_BUCKET_SIZE - 1
+        inside = (self.bucket_starts >= low) & (bucket_ends <= high)
+        overlapping = (bucket_ends >= low) & (self.bucket_starts <= high)
+        bits = np.zeros((self.num_rows + 7) // 8, dtype=np.uint8)
+        for i in np.flatnonzero(inside):
+            np.bitwise_or(bits, self.bucket_bits[i], out=bits)
+        edges = np.flatnonzero(overlapping & ~inside)
+        if len(edges):
+            edge_bits = np.zeros_like(bits)
+            for i in edges:
+                np.bitwise_or(edge_bits, self.bucket_bits[i], out=edge_bits)
+            if self.years is not None:
+                np.bitwise_and(edge_bits, self.pack((self.years >= low) & (self.years <= high)), out=edge_bits)
+            np.bitwise_or(bits, edge_bits, out=bits)
+        return bits
+
+    def select(self, quiz_filter: QuizFilter) -> np.ndarray:
+        """
+        Returns the bitmap of rows matching a filter.
+
+        Raises:
+            ValueError: If the filter names a value that does not occur in the data.
+        """
+        bits = self.all_rows()
+        for column, wanted in (("Category", quiz_filter.categories),
+                               ("Style", quiz_filter.styles),
+                               ("Face_or_body", quiz_filter.face_or_body)):
+            if wanted:
+                np.bitwise_and(bits, self._any_of(column, wanted), out=bits)
+        if quiz_filter.year_from is not None or quiz_filter.year_to is not None:
+            np.bitwise_and(bits, self._year_range(quiz_filter.year_from, quiz_filter.year_to), out=bits)
+        return bits
+
+
+def add_filter_arguments(parser):
+    """
+    Adds the theme options shared by main.py and gui.py to an argparse parser.
+    """
+    parser.add_argument("--category", action="append", default=[], help="Only this movement (repeatable)")
+    parser.add_argument("--style", action="append", default=[], help="Only this period (repeatable)")
+    parser.add_argument("--face-or-body", action="append", default=[], choices=["face", "body", "none"],
+                        help="Only artworks depicting a face, a body or neither (repeatable)")
+    parser.add_argument("--years", help="Only artworks from this range, e.g. 1850-1900")
+
+
+def filter_from_args(args) -> QuizFilter:
+    """
+    Builds a QuizFilter from parsed theme options.
+
+    Raises:
+        ValueError: If --years is not of the form FROM-TO.
+    """
+    year_from = year_to = None
+    if args.years:
+        start, sep, end = args.years.partition("-")
+        if not sep:
+            raise ValueError(f"Invalid year range '{args.years}', expected FROM-TO")
+        year_from = int(start) if start.strip() else None
+        year_to = int(end) if end.strip() else None
+    return QuizFilter(args.category, args.style, args.face_or_body, year_from, year_to)
@@ -0,0 +1,145 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from quiz_index import BASE_COLUMNS, KEY_COLUMN
+
+URL_COLUMNS = ["Image URL", "Painting Info URL", "Artist Info URL"]
+
+
+def artwork_keys(df: pd.DataFrame, metadata_columns: Sequence[str] = ()) -> np.ndarray:
+    """
+    Returns a 64-bit hash per row of the normalized (lower-cased, stripped) Artist and Title,
+    the same key merge_quiz_and_urls joins on, plus any extra metadata columns given.
+    """
+    normalized = pd.DataFrame({
+        "Artist": df["Artist"].astype(str).str.lower().str.strip(),
+        "Title": df["Title"].astype(str).str.lower().str.strip(),
+    })
+    for col in metadata_columns:
+        if col not in ("Artist", "Title"):
+            normalized[col] = df[col]
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy(dtype=np.uint64)
+
+
+def _url_mentions_year(df: pd.DataFrame) -> np.ndarray:
+    """
+    True where the painting info URL contains the row's year, as WikiArt URLs usually do.
+    Used to pick the right URLs when several artworks share an Artist/Title key.
+    """
+    if "Painting Info URL" not in df.columns or "Year_exact" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    years = df["Year_exact"].map(lambda y: "" if pd.isna(y) else str(int(y)))
+    urls = df["Painting Info URL"].fillna("").astype(str)
+    return np.array([bool(y) and y in u for y, u in zip(years, urls)], dtype=bool)
+
+
+class IntegrityReport:
+    """
+    Summary of one integrity pass, with the removed rows kept for inspection.
+
+    Attributes:
+        input_rows (int): Rows before the pass.
+        duplicate_keys (int): Artworks (Artist/Title plus quiz metadata) that occurred on more than one row.
+        duplicate_rows (int): Rows removed as duplicates.
+        shared_titles (int): Artist/Title keys kept for more than one distinct artwork (e.g. 'Untitled').
+        unplayable_rows (int): Rows removed because no question type can use them.
+        output_rows (int): Rows left for the game.
+        quarantined (pd.DataFrame): Removed rows, with a 'Reason' column.
+    """
+    def __init__(self):
+        self.input_rows = 0
+        self.duplicate_keys = 0
+        self.duplicate_rows = 0
+        self.shared_titles = 0
+        self.unplayable_rows = 0
+        self.output_rows = 0
+        self.quarantined = pd.DataFrame()
+
+    def summary(self) -> str:
+        return (
+            f"Integrity check: {self.input_rows} rows in, {self.output_rows} playable rows kept.\n"
+            f" Duplicated artworks: {self.duplicate_keys}, {self.duplicate_rows} duplicate rows removed.\n"
+            f" Artist/Title keys shared by distinct artworks: {self.shared_titles}.\n"
+            f" Unplayable rows removed: {self.unplayable_rows}."
+        )
+
+
+def playable_mask(df: pd.DataFrame, required_column_sets: Sequence[Sequence[str]]) -> np.ndarray:
+    """
+    Returns True for rows that have all base columns and the required columns of at least one question type.
+    """
+    missing = [col for col in BASE_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s) {', '.join(missing)} in quiz data.")
+    mask = df[BASE_COLUMNS].notna().all(axis=1).to_numpy()
+    usable_by_any = np.zeros(len(df), dtype=bool)
+    for columns in required_column_sets:
+        if all(col in df.columns for col in columns):
+            usable_by_any |= df[list(columns)].notna().all(axis=1).to_numpy()
+    return mask & usable_by_any
+
+
+def run_integrity_pass(df: pd.DataFrame, required_column_sets: Sequence[Sequence[str]]) -> Tuple[pd.DataFrame, IntegrityReport]:
+    """
+    Deduplicates rows describing the same artwork and drops rows no question type can use.
+
+    An artwork is identified by its normalized Artist/Title key plus all quiz metadata (every non-URL column),
+    so repeated keys in the URLs file that fan out one quiz row are collapsed, while distinct artworks that
+    share a title are kept. Among duplicates the row with the most URLs filled in is kept, then one whose
+    painting URL mentions the artwork's year, then the first. The kept rows get an 'Artwork_key' column with
+    the artwork hash and a fresh 0..n-1 index, so row positions can be used by the game's indexes.
+
+    Args:
+        df (pd.DataFrame): Merged quiz data.
+        required_column_sets: REQUIRED_COLUMNS of every question type in play.
+
+    Returns:
+        Tuple[pd.DataFrame, IntegrityReport]: Playable rows and the report.
+    """
+    report = IntegrityReport()
+    report.input_rows = len(df)
+    df = df.reset_index(drop=True)
+    url_columns = [col for col in URL_COLUMNS if col in df.columns]
+    metadata_columns = [col for col in df.columns if col not in url_columns and col != KEY_COLUMN]
+    keys = artwork_keys(df, metadata_columns)
+    df[KEY_COLUMN] = keys
+
+    # Rank rows within each artwork: most complete URLs, then URLs matching the year, then original order
+    completeness = df[url_columns].notna().sum(axis=1).to_numpy()
+    order = np.lexsort((np.arange(len(df)), ~_url_mentions_year(df), -completeness, keys))
+    first_of_key = np.ones(len(df), dtype=bool)
+    first_of_key[1:] = keys[order][1:] != keys[order][:-1]
+    keep = np.zeros(len(df), dtype=bool)
+    keep[order[first_of_key]] = True
+
+    counts = pd.Series(keys).value_counts()
+    report.duplicate_keys = int((counts > 1).sum())
+    report.duplicate_rows = int((~keep).sum())
+
+    playable = playable_mask(df, required_column_sets)
+    unplayable = keep & ~playable
+    report.unplayable_rows = int(unplayable.sum())
+    title_counts = pd.Series(artwork_keys(df[keep & playable])).value_counts()
+    report.shared_titles = int((title_counts > 1).sum())
+
+    quarantined: List[pd.DataFrame] = []
+    if report.duplicate_rows:
+        quarantined.append(df[~keep].assign(Reason="duplicate artwork"))
+    if report.unplayable_rows:
+        quarantined.append(df[unplayable].assign(Reason="unplayable"))
+    if quarantined:
+        report.quarantined = pd.concat(quarantined)
+
+    clean = df[keep & playable].reset_index(drop=True)
+    report.output_rows = len(clean)
+    return clean, report
+
+
+def write_quarantine(report: IntegrityReport, path) -> Optional[int]:
+    """
+    Writes the quarantined rows to a TSV file and returns how many were written, or None if there were none.
+    """
+    if report.quarantined.empty:
+        return None
+    report.quarantined.to_csv(path, sep="\t", index=False)
+    return len(report.quarantined)
@@ -1,15 +1,21 @@
 from pathlib import Path
+from typing import Optional, Sequence
 import pandas as pd
 from data_matcher import merge_quiz_and_urls
+from data_integrity import run_integrity_pass, write_quarantine
 
-def load_artwork_data(quiz_path: Path, urls_path: Path) -> pd.DataFrame:
+def load_artwork_data(quiz_path: Path, urls_path: Path, required_column_sets: Sequence[Sequence[str]],
+                      quarantine_path: Optional[Path] = None) -> pd.DataFrame:
     """
     Loads quiz data and URLs from the provided paths, merges them,
-    trims whitespace from important columns, and returns the final DataFrame for the quiz game.
+    trims whitespace from important columns, runs the integrity pass
+    (deduplication and removal of unplayable rows), and returns the final DataFrame for the quiz game.
 
     Args:
         quiz_path (Path): Path to the TSV file with quiz data.
         urls_path (Path): Path to the TSV file with URLs/info data.
+        required_column_sets: REQUIRED_COLUMNS of every question type in play; rows none of them can use are dropped.
+        quarantine_path (Path, optional): If given, rows removed by the integrity pass are written there as TSV.
 
     Returns:
         pd.DataFrame: Combined and cleaned quiz dataframe for use in the quiz.
@@ -28,9 +34,16 @@ def load_artwork_data(quiz_path: Path, urls_path: Path) -> pd.DataFrame:
     
     df = merge_quiz_and_urls(str(quiz_path), str(urls_path))
     
-    # Trim whitespace in important string columns, if they exist
+    # Trim whitespace in important string columns, if they exist; missing values stay missing
     for col in ["Artist", "Title", "Style", "Category", "Face_or_body"]:
         if col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str).str.strip())
+
+    df, report = run_integrity_pass(df, required_column_sets)
+    print(report.summary())
+    if quarantine_path is not None:
+        written = write_quarantine(report, quarantine_path)
+        if written:
+            print(f"Quarantined {written} rows to: {quarantine_path}")
 
     return df
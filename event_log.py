@@ -0,0 +1,349 @@
+import json
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+
+# Outcome codes stored in each record
+OUTCOME_CORRECT = 0
+OUTCOME_WRONG = 1
+OUTCOME_PASSED = 2
+OUTCOME_QUIT = 3
+OUTCOME_NAMES = ["correct", "wrong", "passed", "quit"]
+
+# Dimensions tracked per event, in the order they are stored in the record
+DIMENSIONS = ["question", "artist", "style", "category", "decade"]
+UNKNOWN_KEY = "(unknown)"
+
+LOG_MAGIC = b"AQEV\x01\x00\x00\x00"      # File signature + format version
+# One fixed-size little-endian record per event:
+# timestamp, artist id, style id, category id, decade id, question id, outcome
+RECORD_STRUCT = struct.Struct("<dIHHHBB")
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("artist", "<u4"),
+    ("style", "<u2"),
+    ("category", "<u2"),
+    ("decade", "<u2"),
+    ("question", "u1"),
+    ("outcome", "u1"),
+])
+assert RECORD_DTYPE.itemsize == RECORD_STRUCT.size
+
+
+def _key_text(value) -> str:
+    """
+    Converts a metadata value into the string stored in the key table.
+    Whole-number floats such as decades are stored without the trailing '.0'.
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return UNKNOWN_KEY
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    text = str(value).strip()
+    return text or UNKNOWN_KEY
+
+
+def _lock_exclusive(fh):
+    """
+    Takes a non-blocking exclusive lock on an open file; raises OSError if another process holds it.
+    The lock is released when the file is closed.
+    """
+    if sys.platform == "win32":
+        import msvcrt
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def question_subject(question) -> Optional[dict]:
+    """
+    Returns the artwork a question is about, as used for the per-artist/style/era rollups.
+    Questions showing several artworks are attributed to the first one.
+    """
+    artwork = getattr(question, "artwork", None)
+    if artwork is None:
+        artwork = getattr(question, "art1", None)
+    if artwork is None:
+        return None
+    return artwork.to_dict() if hasattr(artwork, "to_dict") else dict(artwork)
+
+
+class KeyTable:
+    """
+    Append-only string interning table stored next to the event log.
+    Each line is '<dimension>\\t<value>'; ids are the line order within a dimension.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self.values: Dict[str, List[str]] = {dim: [] for dim in DIMENSIONS}
+        self.ids: Dict[str, Dict[str, int]] = {dim: {} for dim in DIMENSIONS}
+        if path.exists():
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    dim, _, value = line.rstrip("\n").partition("\t")
+                    if dim in self.values:
+                        self.ids[dim][value] = len(self.values[dim])
+                        self.values[dim].append(value)
+        self._fh = None
+
+    def intern(self, dim: str, value: str) -> int:
+        """
+        Returns the id of a value, appending it to the table if it is new.
+        """
+        key_id = self.ids[dim].get(value)
+        if key_id is not None:
+            return key_id
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")
+        key_id = len(self.values[dim])
+        self._fh.write(f"{dim}\t{value}\n")
+        self._fh.flush()
+        self.ids[dim][value] = key_id
+        self.values[dim].append(value)
+        return key_id
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class AnswerEventLog:
+    """
+    Append-only binary log with one fixed-size record per answered, passed or quit question.
+    Keeps an AnswerStats aggregator up to date as events are written.
+    Only one writer may have a log open: ids in the key table and the snapshot offset are assigned
+    from this writer's own copy, so the log is locked (via a '.lock' file next to it) until close().
+
+    Raises:
+        OSError: If the log cannot be opened, or another game is already writing to it.
+        ValueError: If the file is not an answer event log.
+    """
+    def __init__(self, path: Union[str, Path], stats: Optional["AnswerStats"] = None):
+        self.path = Path(path)
+        self._fh = None
+        self._lock = open(self.path.with_suffix(self.path.suffix + ".lock"), "a+b")
+        try:
+            _lock_exclusive(self._lock)
+        except OSError as exc:
+            self._lock.close()
+            raise OSError(f"{self.path} is already in use by another game") from exc
+        try:
+            self._open()
+            self.stats = stats if stats is not None else AnswerStats.load(self.path)
+        except Exception:
+            if self._fh is not None:
+                self._fh.close()
+            self._lock.close()
+            raise
+
+    def _open(self):
+        self.keys = KeyTable(self.path.with_suffix(self.path.suffix + ".keys"))
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            with open(self.path, "wb") as fh:
+                fh.write(LOG_MAGIC)
+        else:
+            with open(self.path, "r+b") as fh:
+                if fh.read(len(LOG_MAGIC)) != LOG_MAGIC:
+                    raise ValueError(f"Not an answer event log: {self.path}")
+                # Drop a partial trailing record left by an interrupted write
+                body = self.path.stat().st_size - len(LOG_MAGIC)
+                fh.truncate(len(LOG_MAGIC) + body - body % RECORD_STRUCT.size)
+        self._fh = open(self.path, "ab")
+
+    def record(self, question, outcome: int, timestamp: Optional[float] = None):
+        """
+        Appends one event for the given question and outcome code.
+        """
+        artwork = question_subject(question) or {}
+        ids = (
+            self.keys.intern("question", type(question).__name__),
+            self.keys.intern("artist", _key_text(artwork.get("Artist"))),
+            self.keys.intern("style", _key_text(artwork.get("Style"))),
+            self.keys.intern("category", _key_text(artwork.get("Category"))),
+            self.keys.intern("decade", _key_text(artwork.get("Year_decade"))),
+        )
+        question_id, artist_id, style_id, category_id, decade_id = ids
+        self._fh.write(RECORD_STRUCT.pack(
+            time.time() if timestamp is None else timestamp,
+            artist_id, style_id, category_id, decade_id, question_id, outcome,
+        ))
+        self._fh.flush()
+        self.stats.add(ids, outcome)
+        self.stats.offset += RECORD_STRUCT.size
+
+    def close(self):
+        """
+        Flushes the log and writes the aggregator snapshot so the next load only reads new events.
+        """
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            self.keys.close()
+            self.stats.save()
+            self._lock.close()
+
+
+class AnswerStats:
+    """
+    Incremental per-dimension counters (correct, wrong, passed, quit) over an event log.
+    A JSON snapshot records the log offset it covers, so loading only reads events appended since.
+    """
+    def __init__(self, log_path: Path):
+        self.log_path = Path(log_path)
+        self.snapshot_path = self.log_path.with_suffix(self.log_path.suffix + ".stats.json")
+        self.offset = len(LOG_MAGIC)
+        self.counts: Dict[str, np.ndarray] = {
+            dim: np.zeros((0, len(OUTCOME_NAMES)), dtype=np.int64) for dim in DIMENSIONS
+        }
+
+    @classmethod
+    def load(cls, log_path: Union[str, Path]) -> "AnswerStats":
+        """
+        Loads the snapshot for a log (if any) and folds in the events written after it.
+        """
+        stats = cls(Path(log_path))
+        if stats.snapshot_path.exists():
+            with open(stats.snapshot_path, encoding="utf-8") as fh:
+                snapshot = json.load(fh)
+            stats.offset = snapshot["offset"]
+            for dim in DIMENSIONS:
+                rows = snapshot["counts"].get(dim, [])
+                stats.counts[dim] = np.array(rows, dtype=np.int64).reshape(-1, len(OUTCOME_NAMES))
+        stats.catch_up()
+        return stats
+
+    def _grow(self, dim: str, size: int):
+        table = self.counts[dim]
+        if size > len(table):
+            grown = np.zeros((max(size, 2 * len(table)), len(OUTCOME_NAMES)), dtype=np.int64)
+            grown[:len(table)] = table
+            self.counts[dim] = grown
+
+    def add(self, ids: Tuple[int, ...], outcome: int):
+        """
+        Counts one event; ids are given in DIMENSIONS order.
+        """
+        for dim, key_id in zip(DIMENSIONS, ids):
+            self._grow(dim, key_id + 1)
+            self.counts[dim][key_id, outcome] += 1
+
+    def add_records(self, records: np.ndarray):
+        """
+        Counts a block of records read from the log in one vectorized pass per dimension.
+        """
+        if len(records) == 0:
+            return
+        outcomes = records["outcome"].astype(np.int64)
+        for dim in DIMENSIONS:
+            ids = records[dim].astype(np.int64)
+            size = int(ids.max()) + 1
+            self._grow(dim, size)
+            flat = np.bincount(ids * len(OUTCOME_NAMES) + outcomes, minlength=size * len(OUTCOME_NAMES))
+            self.counts[dim][:size] += flat.reshape(size, len(OUTCOME_NAMES))
+
+    def catch_up(self, chunk_records: int = 4_000_000):
+        """
+        Reads events appended to the log after the current offset.
+        """
+        if not self.log_path.exists():
+            return
+        size = self.log_path.stat().st_size
+        complete = (size - self.offset) // RECORD_DTYPE.itemsize
+        if complete <= 0:
+            return
+        with open(self.log_path, "rb") as fh:
+            fh.seek(self.offset)
+            while complete > 0:
+                count = min(complete, chunk_records)
+                records = np.fromfile(fh, dtype=RECORD_DTYPE, count=count)
+                self.add_records(records)
+                self.offset += len(records) * RECORD_DTYPE.itemsize
+                complete -= len(records)
+
+    def save(self):
+        """
+        Writes the snapshot atomically next to the log.
+        """
+        snapshot = {
+            "offset": self.offset,
+            "counts": {dim: self.counts[dim].tolist() for dim in DIMENSIONS},
+        }
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(snapshot, fh)
+        tmp_path.replace(self.snapshot_path)
+
+    def summary(self, dim: str, keys: KeyTable) -> List[dict]:
+        """
+        Returns one row per value of a dimension with counts, accuracy and pass rate.
+        Accuracy is correct / answered; pass rate is passed / all events.
+        """
+        rows = []
+        for key_id, (correct, wrong, passed, quit_) in enumerate(self.counts[dim].tolist()):
+            total = correct + wrong + passed + quit_
+            if total == 0:
+                continue
+            answered = correct + wrong
+            rows.append({
+                "key": keys.values[dim][key_id] if key_id < len(keys.values[dim]) else f"#{key_id}",
+                "events": total,
+                "answered": answered,
+                "accuracy": correct / answered if answered else 0.0,
+                "pass_rate": passed / total,
+            })
+        return rows
+
+
+def report(log_path: Union[str, Path], top: int = 10, min_answered: int = 1) -> str:
+    """
+    Builds a text report of the weakest artists, styles, categories and decades,
+    plus totals per question class. Updates the stats snapshot on the way.
+    """
+    log_path = Path(log_path)
+    if not log_path.exists():
+        raise FileNotFoundError(f"Event log not found: {log_path}")
+    keys = KeyTable(log_path.with_suffix(log_path.suffix + ".keys"))
+    stats = AnswerStats.load(log_path)
+    stats.save()
+
+    total_events = int(stats.counts["question"].sum())
+    lines = [f"Answer events: {total_events}"]
+    for dim in DIMENSIONS:
+        rows = [r for r in stats.summary(dim, keys) if r["answered"] >= min_answered]
+        if dim == "question":
+            rows.sort(key=lambda r: r["key"])
+            title = "Per question type"
+        else:
+            rows.sort(key=lambda r: (r["accuracy"], -r["answered"]))
+            rows = rows[:top]
+            title = f"Weakest {dim} (lowest accuracy)"
+        lines.append(f"\n{title}:")
+        lines.append(f"  {'key':<40} {'events':>10} {'answered':>10} {'accuracy':>9} {'pass rate':>9}")
+        for r in rows:
+            lines.append(
+                f"  {r['key'][:40]:<40} {r['events']:>10} {r['answered']:>10} "
+                f"{r['accuracy']:>9.1%} {r['pass_rate']:>9.1%}"
+            )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize an art quiz answer event log.")
+    parser.add_argument("command", choices=["report"])
+    parser.add_argument("log", nargs="?", default="answer_events.log")
+    parser.add_argument("--top", type=int, default=10, help="Rows to show per dimension")
+    parser.add_argument("--min-answered", type=int, default=1, help="Hide keys with fewer answered events")
+    args = parser.parse_args()
+    try:
+        print(report(args.log, top=args.top, min_answered=args.min_answered))
+    except (FileNotFoundError, ValueError) as exc:
+        print(exc)
+        sys.exit(1)
@@ -1,6 +1,8 @@
 import random
-from typing import List, Type, Tuple, Optional, Union
+from pathlib import Path
+from typing import Dict, List, Type, Tuple, Optional, Union
 import pandas as pd
+from event_log import AnswerEventLog, OUTCOME_CORRECT, OUTCOME_WRONG, OUTCOME_PASSED, OUTCOME_QUIT
 
 # Import all question classes
 from questions import (
@@ -9,61 +11,199 @@ from questions import (
     ArtistAuthorshipCheck,
     OldestArtworkCheck,
     FaceOrBodyPresenceCheck,
+    MovementChoice,
+    StyleChoice,
+    DecadeChoice,
+    OddOneOut,
 )
+from quiz_index import QuizIndex
+from bitmap_index import QuizFilter
+from scheduler import PASSED_DELAY, ReviewScheduler, review_path
 
 STARTING_LIVES = 3                       # Amount of lives a player starts with
 LIVES_BONUS_THRESHOLD = 10               # Consecutive correct answers to earn extra life
 MAX_CONSECUTIVE_PASSES = 3               # Max questions that can be passed in a row
+MAX_CONSECUTIVE_REVIEWS = 3              # Review questions in a row before a fresh one is mixed in
 QUESTION_CLASSES: List[Type[QuizQuestion]] = [
     YearExactCheck,
     ArtistAuthorshipCheck,
     OldestArtworkCheck,
     FaceOrBodyPresenceCheck,
+    MovementChoice,
+    StyleChoice,
+    DecadeChoice,
+    OddOneOut,
 ]
+QUESTION_CLASSES_BY_NAME: Dict[str, Type[QuizQuestion]] = {cls.__name__: cls for cls in QUESTION_CLASSES}
 
 class ArtQuizGame:
     """
     Main class to manage quiz game logic: runs rounds, tracks score and lives, and provides user interactions.
     """
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, event_log: Optional[AnswerEventLog] = None,
+                 index: Optional[QuizIndex] = None, review_dir: Optional[Path] = None):
         self.data = data
+        self.event_log = event_log
+        # Group indexes are built once per dataset and kept across restarts
+        self.index = index if index is not None else QuizIndex(data)
+        # Per-player review state is stored here; None disables spaced repetition
+        self.review_dir = review_dir
+        self.scheduler: Optional[ReviewScheduler] = None
+        self.consecutive_reviews = 0
         self.lives = STARTING_LIVES
         self.score = 0
         self.consecutive_correct = 0
         self.round_number = 1
         self.consecutive_passes = 0
 
-    def play_round(self) -> Tuple[bool, int, Optional[Union[dict, Tuple[dict, dict]]], Optional[bool]]:
+    def set_filter(self, quiz_filter: QuizFilter) -> int:
         """
-        Run a quiz round by preparing and asking a randomly chosen question.
-        Returns tuple containing: whether to continue, earned points, artwork info, correctness indicator.
+        Restrict following questions to artworks matching a player's theme.
+        Returns the number of playable artworks that match; the theme is kept across restarts.
+
+        Raises:
+            ValueError: If the filter names a value that does not occur in the data.
+        """
+        return self.index.apply_filter(quiz_filter)
+
+    def open_reviews(self, player_name: str):
+        """
+        Load the player's spaced-repetition state, if reviews are enabled.
+        """
+        if self.review_dir is None:
+            return
+        try:
+            self.scheduler = ReviewScheduler.load(review_path(self.review_dir, player_name))
+        except ValueError as exc:
+            print(f"{exc}. Starting with a fresh review history.")
+            self.scheduler = ReviewScheduler(review_path(self.review_dir, player_name))
+
+    def save_reviews(self):
+        """
+        Persist the player's spaced-repetition state, if any.
+        """
+        if self.scheduler is None:
+            return
+        try:
+            self.scheduler.save()
+        except OSError as exc:
+            print(f"Could not save review state: {exc}")
+
+    def _review_available(self, key: int, type_name: str) -> bool:
+        question_class = QUESTION_CLASSES_BY_NAME.get(type_name)
+        position = self.index.position_of(key)
+        return (question_class is not None and position is not None
+                and self.index.is_eligible(position, question_class.REQUIRED_COLUMNS))
+
+    def _review_waiting(self, question: QuizQuestion) -> bool:
+        if self.scheduler is None or getattr(question, "position", None) is None:
+            return False
+        key = self.index.key_at(question.position)
+        return key is not None and self.scheduler.is_waiting(key, type(question).__name__)
+
+    def review_question(self) -> Optional[QuizQuestion]:
+        """
+        Return a prepared question for the player's most overdue review item, or None if nothing is due
+        or a fresh question is due for variety.
+        """
+        if self.scheduler is None or self.consecutive_reviews >= MAX_CONSECUTIVE_REVIEWS:
+            self.consecutive_reviews = 0
+            return None
+        item = self.scheduler.next_due(self._review_available)
+        if item is None:
+            self.consecutive_reviews = 0
+            return None
+        key, type_name = item
+        question = QUESTION_CLASSES_BY_NAME[type_name](self.data, self.index)
+        try:
+            if question.prepare_question(self.index.position_of(key)):
+                self.consecutive_reviews += 1
+                return question
+        except Exception as exc:
+            print(f"Error preparing a question: {exc}")
+        self.scheduler.defer(key, type_name)
+        self.consecutive_reviews = 0
+        return None
+
+    def record_review(self, question: QuizQuestion, is_correct: bool):
         """
+        Update the review schedule for the artwork a question was about.
+        Items that are tracked but not due yet keep their schedule; the answer only advances the player's step.
+        """
+        if self.scheduler is None or getattr(question, "position", None) is None:
+            return
+        key = self.index.key_at(question.position)
+        if key is None or self._review_waiting(question):
+            self.scheduler.advance()
+        else:
+            self.scheduler.record(key, type(question).__name__, is_correct)
+
+    def defer_review(self, question: QuizQuestion):
+        """
+        Push a passed question's review item back a few answers, so a due review does not repeat immediately.
+        """
+        if self.scheduler is None or getattr(question, "position", None) is None:
+            return
+        key = self.index.key_at(question.position)
+        if key is not None:
+            self.scheduler.defer(key, type(question).__name__, PASSED_DELAY)
+
+    def record_event(self, question: QuizQuestion, outcome: int):
+        """
+        Append an answered/passed/quit event to the answer log, if one is attached.
+        """
+        if self.event_log is None:
+            return
+        try:
+            self.event_log.record(question, outcome)
+        except OSError as exc:
+            print(f"Could not write answer event: {exc}")
+
+    def random_question(self) -> Optional[QuizQuestion]:
+        """
+        Return a prepared question of a random type about a random eligible artwork, or None.
+        Items the player is scheduled to review later are redrawn, unless nothing else turns up.
+        """
+        fallback = None
         # Attempt up to 20 times to find a question with enough data
         for _ in range(20):
             question_class = random.choice(QUESTION_CLASSES)
-            question = question_class(self.data)
+            question = question_class(self.data, self.index)
             try:
                 if question.prepare_question():
-                    break
+                    if not self._review_waiting(question):
+                        return question
+                    fallback = fallback or question
             except Exception as exc:
                 print(f"Error preparing a question: {exc}")
-        else:
+        return fallback
+
+    def play_round(self) -> Tuple[bool, int, Optional[Union[dict, Tuple[dict, dict]]], Optional[bool]]:
+        """
+        Run a quiz round by asking a due review item, or else a randomly chosen fresh question.
+        Returns tuple containing: whether to continue, earned points, artwork info, correctness indicator.
+        """
+        question = self.review_question() or self.random_question()
+        if question is None:
             print("No valid questions are available. Ending game.")
             return False, 0, None, None
 
         question.show_question()
 
         while True:
-            user_input = input("Answer the question (yes/no or 1/2/s), 'p' to pass, 'q' to quit: ").strip().lower()
+            user_input = input("Answer the question (yes/no, 1-4 or s), 'p' to pass, 'q' to quit: ").strip().lower()
             if user_input == 'p':
                 if self.consecutive_passes >= MAX_CONSECUTIVE_PASSES:
                     print(f"You reached the max consecutive passes ({MAX_CONSECUTIVE_PASSES}). You must answer or quit.")
                     continue
                 print("Question passed without penalty.")
+                self.record_event(question, OUTCOME_PASSED)
+                self.defer_review(question)
                 self.consecutive_passes += 1
                 return True, 0, None, None
             if user_input == 'q':
                 print("Quitting game.")
+                self.record_event(question, OUTCOME_QUIT)
                 self.lives = 0
                 return False, 0, None, None
 
@@ -78,6 +218,8 @@ class ArtQuizGame:
                 continue
 
             is_correct, points, artwork = result
+            self.record_event(question, OUTCOME_CORRECT if is_correct else OUTCOME_WRONG)
+            self.record_review(question, is_correct)
             self.consecutive_passes = 0
             return True, points if is_correct else 0, artwork, is_correct
 
@@ -87,6 +229,7 @@ class ArtQuizGame:
         """
         print("Welcome to the Infinite Art Quiz Game!")
         player_name = input("Please enter your name: ").strip() or "Player"
+        self.open_reviews(player_name)
         print(f"\nHello, {player_name}! You start with {self.lives} lives.")
         print(f"Every {LIVES_BONUS_THRESHOLD} consecutive correct answers you gain an extra life.")
         print(f"You may pass up to {MAX_CONSECUTIVE_PASSES} questions in a row without penalty.\n")
@@ -135,10 +278,11 @@ class ArtQuizGame:
                     else:
                         print("Invalid input, please press Enter or 'q'.")
 
+            self.save_reviews()
             print(f"\nGame over, {player_name}! Your final score was: {self.score}")
             restart = input("Do you want to play again? [yes/no]: ").strip().lower()
             if restart in {"y", "yes", "ja", "si"}:
-                self.__init__(self.data)
+                self.__init__(self.data, self.event_log, self.index, self.review_dir)
                 self.start()
             else:
                 print("Thanks for playing! Goodbye.")
@@ -1,13 +1,22 @@
+from typing import Dict, Optional, Tuple
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 import webbrowser
 from data_loader import load_artwork_data
 from game import ArtQuizGame
+from quiz_index import QuizIndex
+from event_log import AnswerEventLog, OUTCOME_CORRECT, OUTCOME_WRONG, OUTCOME_PASSED, OUTCOME_QUIT
+from bitmap_index import QuizFilter, add_filter_arguments, filter_from_args
 from questions import (
     YearExactCheck,
     ArtistAuthorshipCheck,
     OldestArtworkCheck,
     FaceOrBodyPresenceCheck,
+    MultipleChoiceQuestion,
+    MovementChoice,
+    StyleChoice,
+    DecadeChoice,
+    OddOneOut,
 )
 
 # Patch in the question classes for GUI logic
@@ -16,17 +25,32 @@ QUESTION_CLASSES = [
     ArtistAuthorshipCheck,
     OldestArtworkCheck,
     FaceOrBodyPresenceCheck,
+    MovementChoice,
+    StyleChoice,
+    DecadeChoice,
+    OddOneOut,
+]
+
+MAX_LINKED_ARTWORKS = 4          # Most artworks a question shows (odd one out)
+LINK_FIELDS = [
+    ("Image URL", "Image URL"),
+    ("Painting Info", "Painting Info URL"),
+    ("Artist Info", "Artist Info URL"),
 ]
 
 class ArtQuizGUI:
-    def __init__(self, root, game):
+    def __init__(self, root, game, player_name=None):
         self.root = root
         self.game = game
         self.max_consecutive_passes = 3
 
-        # PLAYER NAME
-        self.player_name = simpledialog.askstring("Welcome!", "Enter your name:") or "Player"
-        self.root.title(f"Art Quiz for {self.player_name}")
+        # PLAYER NAME (asked for unless given, e.g. by the soak test)
+        self.player_name = player_name or simpledialog.askstring("Welcome!", "Enter your name:") or "Player"
+        self.game.open_reviews(self.player_name)
+        self.update_title()
+
+        # --- THEME MENU ---
+        self.build_theme_menu()
 
         # --- HEADER COUNTERS ---
         counter_frame = tk.Frame(root)
@@ -50,14 +74,18 @@ class ArtQuizGUI:
         self.btn_yes.pack(side="left", padx=8)
         self.btn_no.pack(side="left", padx=8)
 
-        # 1/2/Same
+        # 1/2/3/4/Same
         self.frame_12same = tk.Frame(root, bg="#f8c4cb", padx=8, pady=3)
         self.frame_12same.pack(pady=2)
         self.btn_1 = tk.Button(self.frame_12same, text="1", width=8, font=("Arial", 11), command=lambda: self.on_answer("1"))
         self.btn_2 = tk.Button(self.frame_12same, text="2", width=8, font=("Arial", 11), command=lambda: self.on_answer("2"))
+        self.btn_3 = tk.Button(self.frame_12same, text="3", width=8, font=("Arial", 11), command=lambda: self.on_answer("3"))
+        self.btn_4 = tk.Button(self.frame_12same, text="4", width=8, font=("Arial", 11), command=lambda: self.on_answer("4"))
         self.btn_same = tk.Button(self.frame_12same, text="Same", width=8, font=("Arial", 11), command=lambda: self.on_answer("s"))
         self.btn_1.pack(side="left", padx=8)
         self.btn_2.pack(side="left", padx=8)
+        self.btn_3.pack(side="left", padx=8)
+        self.btn_4.pack(side="left", padx=8)
         self.btn_same.pack(side="left", padx=8)
 
         # Pass/Quit
@@ -75,6 +103,18 @@ class ArtQuizGUI:
         self.extra_label.pack(pady=2)
         self.links_frame = tk.Frame(root)
         self.links_frame.pack()
+        # Fixed pool of link widgets, reused every round: a title and one label per link for each artwork
+        self.link_urls = {}
+        self.shown_links = []
+        self.link_slots = []
+        for _ in range(MAX_LINKED_ARTWORKS):
+            title_label = tk.Label(self.links_frame, text="", font=("Arial", 10, "bold"))
+            links = []
+            for label, _ in LINK_FIELDS:
+                link = tk.Label(self.links_frame, text=label, fg="blue", cursor="hand2", font=("Arial", 10, "underline"))
+                link.bind("<Button-1>", self.open_link)
+                links.append(link)
+            self.link_slots.append((title_label, links))
 
         # --- NEXT & RESTART BUTTONS ---
         self.next_button = tk.Button(root, text="Next", width=12, font=("Arial", 11), command=self.next_question, state="disabled")
@@ -89,14 +129,132 @@ class ArtQuizGUI:
         # Start game
         self.next_question()
 
+    def update_title(self):
+        quiz_filter = self.game.index.filter
+        theme = "" if quiz_filter.is_empty() else f" — {quiz_filter.describe()}"
+        self.root.title(f"Art Quiz for {self.player_name}{theme}")
+
+    def build_theme_menu(self):
+        bitmaps = self.game.index.bitmaps
+        current = self.game.index.filter
+        menubar = tk.Menu(self.root)
+        theme_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Theme", menu=theme_menu)
+
+        self.theme_category = tk.StringVar()
+        self.theme_style = tk.StringVar()
+        self.theme_figures = tk.StringVar()
+        self.theme_era = tk.StringVar()
+        # Parts of the starting theme a single menu choice cannot express (several values, or years
+        # off the century grid, e.g. from command-line arguments) are offered as an extra choice
+        self.theme_kept: Dict[str, Tuple[str, object]] = {}
+        for field, values in [("categories", current.categories), ("styles", current.styles),
+                              ("face_or_body", current.face_or_body)]:
+            if len(values) > 1:
+                self.theme_kept[field] = (" or ".join(values), list(values))
+        years = (current.year_from, current.year_to)
+        if years != (None, None) and self.era_label(*years) is None:
+            self.theme_kept["years"] = (
+                f"{'…' if years[0] is None else years[0]}–{'…' if years[1] is None else years[1]}", years)
+        self.sync_theme_menu(current)
+
+        for label, field, var, choices in [
+                ("Movement", "categories", self.theme_category, bitmaps.choices("Category")),
+                ("Period", "styles", self.theme_style, bitmaps.choices("Style")),
+                ("Figures", "face_or_body", self.theme_figures, bitmaps.choices("Face_or_body")),
+            ]:
+            submenu = tk.Menu(theme_menu, tearoff=0)
+            if field in self.theme_kept:
+                choices = [self.theme_kept[field][0]] + choices
+            for choice in ["All"] + choices:
+                submenu.add_radiobutton(label=choice, value=choice, variable=var, command=self.apply_theme)
+            theme_menu.add_cascade(label=label, menu=submenu)
+
+        # Eras are whole centuries spanning the data's 5-year groups
+        era_menu = tk.Menu(theme_menu, tearoff=0)
+        eras = ["All"]
+        if "years" in self.theme_kept:
+            eras.append(self.theme_kept["years"][0])
+        if len(bitmaps.bucket_starts):
+            first = int(bitmaps.bucket_starts.min()) // 100 * 100
+            last = int(bitmaps.bucket_starts.max())
+            eras += [self.era_label(start, start + 99) for start in range(first, last + 1, 100)]
+        for era in eras:
+            era_menu.add_radiobutton(label=era, value=era, variable=self.theme_era, command=self.apply_theme)
+        theme_menu.add_cascade(label="Era", menu=era_menu)
+        self.root.config(menu=menubar)
+
+    @staticmethod
+    def era_label(year_from: Optional[int], year_to: Optional[int]) -> Optional[str]:
+        """
+        Returns the Era menu label for a year range, or None if the range is not a whole century.
+        """
+        if year_from is None or year_to is None or year_from % 100 or year_to != year_from + 99:
+            return None
+        return f"{year_from}-{year_to}"
+
+    def sync_theme_menu(self, quiz_filter: QuizFilter):
+        """
+        Sets the Theme menu's selected choices to match a filter.
+        """
+        def choice(field, values):
+            if field in self.theme_kept and self.theme_kept[field][1] == values:
+                return self.theme_kept[field][0]
+            return values[0] if len(values) == 1 else "All"
+
+        self.theme_category.set(choice("categories", quiz_filter.categories))
+        self.theme_style.set(choice("styles", quiz_filter.styles))
+        self.theme_figures.set(choice("face_or_body", quiz_filter.face_or_body))
+        years = (quiz_filter.year_from, quiz_filter.year_to)
+        if "years" in self.theme_kept and self.theme_kept["years"][1] == years:
+            self.theme_era.set(self.theme_kept["years"][0])
+        else:
+            self.theme_era.set(self.era_label(*years) or "All")
+
+    def apply_theme(self):
+        previous = self.game.index.filter
+
+        def chosen(field, var):
+            if field in self.theme_kept and var.get() == self.theme_kept[field][0]:
+                return self.theme_kept[field][1]
+            return [] if var.get() == "All" else [var.get()]
+
+        year_from = year_to = None
+        if "years" in self.theme_kept and self.theme_era.get() == self.theme_kept["years"][0]:
+            year_from, year_to = self.theme_kept["years"][1]
+        elif self.theme_era.get() != "All":
+            year_from, year_to = (int(y) for y in self.theme_era.get().split("-"))
+        quiz_filter = QuizFilter(chosen("categories", self.theme_category), chosen("styles", self.theme_style),
+                                 chosen("face_or_body", self.theme_figures), year_from, year_to)
+        try:
+            matches = self.game.set_filter(quiz_filter)
+        except ValueError as exc:
+            messagebox.showwarning("Theme", str(exc))
+            self.sync_theme_menu(previous)
+            return
+        if matches == 0:
+            messagebox.showwarning("Theme", f"No artworks match: {quiz_filter.describe()}")
+            self.game.set_filter(previous)
+            self.sync_theme_menu(previous)
+            return
+        self.update_title()
+        self.extra_label.config(text=f"Theme: {quiz_filter.describe()} ({matches} artworks), from the next question.", fg="blue")
+
     def update_counters(self):
         self.score_var.set(f"Score: {self.game.score}")
         self.lives_var.set(f"Lives: {self.game.lives}")
         self.passes_var.set(f"Passes: {self.game.consecutive_passes}")
 
     def clear_links(self):
-        for widget in self.links_frame.winfo_children():
-            widget.destroy()
+        for widget in self.shown_links:
+            widget.pack_forget()
+        self.shown_links.clear()
+        self.link_urls.clear()
+
+    def open_link(self, event):
+        url = self.link_urls.get(event.widget)
+        if url:
+            webbrowser.open(url)
 
     def on_answer(self, answer):
         if not self.awaiting_answer:
@@ -116,10 +274,14 @@ class ArtQuizGUI:
                 self.btn_no.config(state="normal")
                 self.btn_1.config(state="normal")
                 self.btn_2.config(state="normal")
+                self.btn_3.config(state="normal")
+                self.btn_4.config(state="normal")
                 self.btn_same.config(state="normal")
                 self.btn_quit.config(state="normal")
                 self.awaiting_answer = True  # Still waiting for a valid answer
                 return
+            self.game.record_event(self.game.current_question, OUTCOME_PASSED)
+            self.game.defer_review(self.game.current_question)
             self.game.consecutive_passes += 1
             self.update_counters()
             self.result_label.config(text="You passed. No penalty. Click Next to read another question.", fg="black")
@@ -130,6 +292,7 @@ class ArtQuizGUI:
 
         # Handle "Quit"
         if answer == "quit":
+            self.game.record_event(self.game.current_question, OUTCOME_QUIT)
             self.end_game("Game ended by player. Thanks for playing!")
             return
 
@@ -142,6 +305,8 @@ class ArtQuizGUI:
                 valid = "Yes or No"
             elif isinstance(q, OldestArtworkCheck):
                 valid = "1, 2, or Same"
+            elif isinstance(q, MultipleChoiceQuestion):
+                valid = ", ".join(str(i) for i in range(1, len(q.options) + 1))
             else:
                 valid = "a valid option"
             self.result_label.config(
@@ -153,6 +318,8 @@ class ArtQuizGUI:
             self.btn_no.config(state="normal")
             self.btn_1.config(state="normal")
             self.btn_2.config(state="normal")
+            self.btn_3.config(state="normal")
+            self.btn_4.config(state="normal")
             self.btn_same.config(state="normal")
             self.btn_quit.config(state="normal")
             self.btn_pass.config(state="disabled")
@@ -234,43 +401,48 @@ class ArtQuizGUI:
             )
         elif isinstance(question, FaceOrBodyPresenceCheck):
             t = f"Does the artwork '{question.artwork['Title']}' depict a human face or body?"
+        elif isinstance(question, MultipleChoiceQuestion):
+            t = "\n".join([question.prompt()] + question.option_lines())
         else:
             t = "Please answer the question."
         self.question_text.config(text=t)
 
     def add_links(self, art, idx):
+        if idx > MAX_LINKED_ARTWORKS:
+            return
+        title_label, links = self.link_slots[idx - 1]
         title = art.get('Title', f'Artwork {idx}')
-        tk.Label(self.links_frame, text=f"{idx}. {title}", font=("Arial", 10, "bold")).pack(anchor="w")
-        for label, key in [
-                ("Image URL", "Image URL"),
-                ("Painting Info", "Painting Info URL"),
-                ("Artist Info", "Artist Info URL"),
-            ]:
+        title_label.config(text=f"{idx}. {title}")
+        title_label.pack(anchor="w")
+        self.shown_links.append(title_label)
+        for link, (_, key) in zip(links, LINK_FIELDS):
             url = art.get(key, "")
             if url:
-                link = tk.Label(self.links_frame, text=f"{label}", fg="blue", cursor="hand2", font=("Arial", 10, "underline"))
+                self.link_urls[link] = url
                 link.pack(anchor="w")
-                link.bind("<Button-1>", lambda e, url=url: webbrowser.open(url))
+                self.shown_links.append(link)
 
     def end_game(self, message):
         self.awaiting_answer = False
+        self.game.save_reviews()
         self.question_text.config(text=message)
         self.result_label.config(text="")
         self.extra_label.config(text="")
-        for btn in (self.btn_yes, self.btn_no, self.btn_1, self.btn_2, self.btn_same, self.btn_pass, self.btn_quit):
+        for btn in (self.btn_yes, self.btn_no, self.btn_1, self.btn_2, self.btn_3, self.btn_4, self.btn_same, self.btn_pass, self.btn_quit):
             btn.config(state="disabled")
         self.next_button.config(state="disabled")
         self.restart_button.pack(pady=12)
 
     def restart_game(self):
-        self.game.__init__(self.game.data)
+        self.game.__init__(self.game.data, self.game.event_log, self.game.index, self.game.review_dir)
+        self.game.open_reviews(self.player_name)
         self.update_counters()
         self.result_label.config(text="")
         self.extra_label.config(text="")
         self.restart_button.pack_forget()
         self.awaiting_answer = True
         # RE-ENABLE ALL interactive buttons
-        for btn in (self.btn_yes, self.btn_no, self.btn_1, self.btn_2, self.btn_same, self.btn_pass, self.btn_quit):
+        for btn in (self.btn_yes, self.btn_no, self.btn_1, self.btn_2, self.btn_3, self.btn_4, self.btn_same, self.btn_pass, self.btn_quit):
             btn.config(state="normal")
         self.next_button.config(state="disabled")
         self.game.consecutive_passes = 0
@@ -281,14 +453,30 @@ class ArtQuizGUI:
 # ------------- ArtQuizGame GUI EXTENSIONS ---------------
 
 def play_round_gui(self):
-    # Prepare a question and store it for the GUI's turn
-    for _ in range(20):
-        question_class = self.QUESTION_CLASSES[self.round_number % len(self.QUESTION_CLASSES)]
-        question = question_class(self.data)
+    # Prepare a question and store it for the GUI's turn; due review items come first
+    question = self.review_question()
+    if question is not None:
+        self.current_question = question
+        self.round_number += 1
+        return True, 0, getattr(question, 'artwork', None), None
+    fallback = None
+    for attempt in range(20):
+        # Move on to the next question type if one has no eligible artworks under the current theme
+        question_class = self.QUESTION_CLASSES[(self.round_number + attempt) % len(self.QUESTION_CLASSES)]
+        question = question_class(self.data, self.index)
         if question.prepare_question():
+            # Redraw items the player is scheduled to review later
+            if self._review_waiting(question):
+                fallback = fallback or (question, attempt)
+                continue
             self.current_question = question
-            self.round_number += 1
+            self.round_number += attempt + 1
             return True, 0, getattr(question, 'artwork', None), None
+    if fallback is not None:
+        question, attempt = fallback
+        self.current_question = question
+        self.round_number += attempt + 1
+        return True, 0, getattr(question, 'artwork', None), None
     return False, 0, None, None
 
 def check_answer_gui(self, user_input):
@@ -304,6 +492,8 @@ def check_answer_gui(self, user_input):
     if result is None:
         return True, 0, getattr(question, 'artwork', None), None
     is_correct, points, artwork = result
+    self.record_event(question, OUTCOME_CORRECT if is_correct else OUTCOME_WRONG)
+    self.record_review(question, is_correct)
     if is_correct:
         self.score += points
         self.consecutive_correct += 1
@@ -322,15 +512,47 @@ if __name__ == "__main__":
     import sys
     from pathlib import Path
 
+    import argparse
+    parser = argparse.ArgumentParser(description="Infinite Art Quiz (graphical).")
+    add_filter_arguments(parser)
+    parser.add_argument("--quarantine", type=Path, help="Write rows removed by the integrity check to this TSV file")
+    args = parser.parse_args()
+    try:
+        quiz_filter = filter_from_args(args)
+    except ValueError as e:
+        parser.error(str(e))
+
     quiz_path = Path("clean_quiz_core_metadata.tsv")
     urls_path = Path("WikiArt-info.tsv")
+    events_path = Path("answer_events.log")
+    review_dir = Path("reviews")
     try:
-        data = load_artwork_data(quiz_path, urls_path)
+        data = load_artwork_data(quiz_path, urls_path, [cls.REQUIRED_COLUMNS for cls in QUESTION_CLASSES],
+                                 args.quarantine)
     except Exception as e:
         messagebox.showerror("File Error", str(e))
         sys.exit()
 
-    game = ArtQuizGame(data)
+    index = QuizIndex(data)
+    try:
+        if not quiz_filter.is_empty() and index.apply_filter(quiz_filter) == 0:
+            raise ValueError(f"No artworks match the theme: {quiz_filter.describe()}")
+    except ValueError as e:
+        messagebox.showerror("Theme Error", str(e))
+        sys.exit()
+
+    try:
+        event_log = AnswerEventLog(events_path)
+    except (OSError, ValueError) as e:
+        print(f"Answer events will not be recorded: {e}")
+        event_log = None
+
+    game = ArtQuizGame(data, event_log, index, review_dir)
     root = tk.Tk()
     gui = ArtQuizGUI(root, game)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        game.save_reviews()
+        if event_log is not None:
+            event_log.close()
@@ -1,27 +1,66 @@
+import argparse
 from pathlib import Path
 from data_loader import load_artwork_data
-from game import ArtQuizGame
+from game import ArtQuizGame, QUESTION_CLASSES
+from quiz_index import QuizIndex
+from event_log import AnswerEventLog
+from bitmap_index import add_filter_arguments, filter_from_args
 
 def main():
     """
     Main entry point for the art quiz game.
-    Loads data, initializes the game, and starts the user interface loop.
+    Loads data, initializes the game, applies the optional theme filter, and starts the user interface loop.
     """
+    parser = argparse.ArgumentParser(description="Infinite Art Quiz (command line).")
+    add_filter_arguments(parser)
+    parser.add_argument("--quarantine", type=Path, help="Write rows removed by the integrity check to this TSV file")
+    args = parser.parse_args()
+    try:
+        quiz_filter = filter_from_args(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
     quiz_path = Path("clean_quiz_core_metadata.tsv")
     urls_path = Path("WikiArt-info.tsv")
+    events_path = Path("answer_events.log")
+    review_dir = Path("reviews")
 
     if not quiz_path.exists() or not urls_path.exists():
         print(f"Quiz file or URLs file not found: '{quiz_path}' or '{urls_path}'")
         return
 
     try:
-        data = load_artwork_data(quiz_path, urls_path)
+        data = load_artwork_data(quiz_path, urls_path, [cls.REQUIRED_COLUMNS for cls in QUESTION_CLASSES],
+                                 args.quarantine)
     except Exception as exc:
         print(f"Failed to load data: {exc}")
         return
 
-    game = ArtQuizGame(data)
-    game.start()
+    index = QuizIndex(data)
+    if not quiz_filter.is_empty():
+        try:
+            matches = index.apply_filter(quiz_filter)
+        except ValueError as exc:
+            print(f"Invalid theme: {exc}")
+            return
+        if matches == 0:
+            print(f"No artworks match the theme: {quiz_filter.describe()}")
+            return
+        print(f"Theme: {quiz_filter.describe()} ({matches} artworks)")
+
+    try:
+        event_log = AnswerEventLog(events_path)
+    except (OSError, ValueError) as exc:
+        print(f"Answer events will not be recorded: {exc}")
+        event_log = None
+
+    game = ArtQuizGame(data, event_log, index, review_dir)
+    try:
+        game.start()
+    finally:
+        game.save_reviews()
+        if event_log is not None:
+            event_log.close()
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional, Union
+from typing import Callable, List, Tuple, Optional, Union
 import random
 import pandas as pd
+from quiz_index import QuizIndex
 
 # Define sets of accepted yes/no responses for users in various languages and forms
 YES_ANSWERS = {"y", "yes", "ja", "si", "true", "t"}
@@ -12,13 +13,44 @@ class QuizQuestion(ABC):
     Abstract base class for quiz questions.
     Defines the required methods to create, display, and check questions.
     """
-    def __init__(self, data: pd.DataFrame):
+    # Columns (besides title, artist and URLs) a row needs to be usable for this question
+    REQUIRED_COLUMNS: List[str] = []
+
+    def __init__(self, data: pd.DataFrame, index: Optional[QuizIndex] = None):
         self.data = data
+        self.index = index
+
+    def _get_index(self) -> QuizIndex:
+        # Fall back to building an index for ad-hoc use; the game passes a shared one
+        if self.index is None:
+            self.index = QuizIndex(self.data)
+        return self.index
+
+    def _pick_position(self, position: Optional[int] = None) -> Optional[int]:
+        """
+        Returns the row the question is about: `position` if it is eligible for this question type, else None;
+        a random eligible row when no position is requested. Sets self.position.
+        """
+        index = self._get_index()
+        if position is None:
+            position = index.random_position(index.pool(self.REQUIRED_COLUMNS))
+        elif not index.is_eligible(position, self.REQUIRED_COLUMNS):
+            position = None
+        self.position = position
+        return position
+
+    def _answers_vary(self, column: str, answer_of: Optional[Callable] = None) -> bool:
+        """
+        Returns whether eligible rows give at least two different answers, where a row's answer is its value
+        in `column` (mapped through `answer_of`). A theme can leave only one, e.g. every artwork depicting a face.
+        """
+        return self._get_index().answer_count(self.REQUIRED_COLUMNS, column, answer_of) >= 2
 
     @abstractmethod
-    def prepare_question(self) -> bool:
+    def prepare_question(self, position: Optional[int] = None) -> bool:
         """
-        Prepare question data for this instance. Return False if not possible.
+        Prepare question data for this instance, about the artwork at row `position` if given
+        (e.g. a review item). Return False if not possible.
         """
         pass
 
@@ -41,19 +73,23 @@ class YearExactCheck(QuizQuestion):
     """
     Question: Is this artwork from this year?
     """
-    def prepare_question(self) -> bool:
-        pool = self.data.dropna(subset=["Year_exact", "Title", "Artist", "Image URL", "Painting Info URL", "Artist Info URL"])
-        if pool.empty:
+    REQUIRED_COLUMNS = ["Year_exact"]
+
+    def prepare_question(self, position: Optional[int] = None) -> bool:
+        index = self._get_index()
+        position = self._pick_position(position)
+        if position is None:
             return False
-        self.artwork = pool.sample(1).iloc[0]
+        self.artwork = index.row(position)
         self.year = int(self.artwork["Year_exact"])
         if random.random() < 0.6:
             self.proposed_year = self.year
             self.correct_answer = True
         else:
             # Other random year from the dataset
-            years = [y for y in pool["Year_exact"].dropna().unique() if y != self.year]
-            self.proposed_year = int(random.choice(years)) if years else self.year
+            years = index.group("Year_exact")
+            others = years.distractors(int(years.codes[position]), 1)
+            self.proposed_year = int(years.values[others[0]]) if others else self.year
             self.correct_answer = (self.proposed_year == self.year)
         return True
 
@@ -76,20 +112,26 @@ class ArtistAuthorshipCheck(QuizQuestion):
     """
     Question: Did this artist make this artwork?
     """
-    def prepare_question(self) -> bool:
-        pool = self.data.dropna(subset=["Artist", "Title", "Image URL", "Painting Info URL", "Artist Info URL"])
-        if pool.empty:
+    REQUIRED_COLUMNS = ["Artist"]
+
+    def prepare_question(self, position: Optional[int] = None) -> bool:
+        index = self._get_index()
+        position = self._pick_position(position)
+        if position is None:
             return False
-        self.artwork = pool.sample(1).iloc[0]
+        self.artwork = index.row(position)
         self.actual_artist = self.artwork["Artist"]
         # 50%: propose actual artist, 50%: propose a random other artist
-        if random.random() < 0.5:
-            self.proposed_artist = self.actual_artist
-            self.correct_answer = True
-        else:
-            other_artists = pool.loc[pool["Artist"].str.lower() != self.actual_artist.lower(), "Artist"].unique()
-            self.proposed_artist = random.choice(other_artists) if len(other_artists) > 0 else self.actual_artist
-            self.correct_answer = (self.proposed_artist == self.actual_artist)
+        self.proposed_artist = self.actual_artist
+        if random.random() >= 0.5:
+            artists = index.group("Artist")
+            # Names differing only in case count as the same artist, so redraw those
+            for _ in range(5):
+                others = artists.distractors(int(artists.codes[position]), 1)
+                if others and artists.values[others[0]].lower() != self.actual_artist.lower():
+                    self.proposed_artist = artists.values[others[0]]
+                    break
+        self.correct_answer = (self.proposed_artist == self.actual_artist)
         return True
 
     def show_question(self):
@@ -111,13 +153,24 @@ class OldestArtworkCheck(QuizQuestion):
     """
     Question: Which of these two artworks is older?
     """
-    def prepare_question(self) -> bool:
-        pool = self.data.dropna(subset=["Year_exact", "Title", "Artist", "Image URL", "Painting Info URL", "Artist Info URL"])
-        if len(pool) < 2:
+    REQUIRED_COLUMNS = ["Year_exact"]
+
+    def prepare_question(self, position: Optional[int] = None) -> bool:
+        index = self._get_index()
+        pool = index.pool(self.REQUIRED_COLUMNS)
+        # With a single year in play the answer would always be 'same age'
+        if len(pool) < 2 or not self._answers_vary("Year_exact"):
             return False
-        sample_two = pool.sample(2)
-        self.art1 = sample_two.iloc[0]
-        self.art2 = sample_two.iloc[1]
+        position = self._pick_position(position)
+        if position is None:
+            return False
+        other = position
+        while other == position:
+            other = index.random_position(pool)
+        # The reviewed artwork is not always shown first
+        first, second = (position, other) if random.random() < 0.5 else (other, position)
+        self.art1 = index.row(first)
+        self.art2 = index.row(second)
         return True
 
     def show_question(self):
@@ -146,13 +199,21 @@ class FaceOrBodyPresenceCheck(QuizQuestion):
     """
     Question: Does this artwork depict a human face or body?
     """
-    def prepare_question(self) -> bool:
-        pool = self.data.dropna(subset=["Face_or_body", "Title", "Image URL", "Painting Info URL", "Artist Info URL"])
-        if pool.empty:
+    REQUIRED_COLUMNS = ["Face_or_body"]
+
+    @staticmethod
+    def depicts_person(presence_info: str) -> bool:
+        return presence_info.lower() in {"face", "body"}
+
+    def prepare_question(self, position: Optional[int] = None) -> bool:
+        index = self._get_index()
+        if not self._answers_vary("Face_or_body", self.depicts_person):
+            return False
+        position = self._pick_position(position)
+        if position is None:
             return False
-        self.artwork = pool.sample(1).iloc[0]
-        presence_info = self.artwork["Face_or_body"].lower()
-        self.correct_answer = presence_info in {"face", "body"}
+        self.artwork = index.row(position)
+        self.correct_answer = self.depicts_person(self.artwork["Face_or_body"])
         return True
 
     def show_question(self):
@@ -169,3 +230,152 @@ class FaceOrBodyPresenceCheck(QuizQuestion):
         is_correct = (is_yes == self.correct_answer)
         print("Correct!" if is_correct else f"Wrong. The presence is: {self.artwork['Face_or_body'].lower()}")
         return is_correct, int(is_correct), self.artwork.to_dict()
+
+class MultipleChoiceQuestion(QuizQuestion):
+    """
+    Base for questions answered by picking one of several numbered options.
+    Subclasses fill self.options (display strings) and self.correct_index in prepare_question.
+    """
+    title = "Multiple Choice"
+    num_options = 4
+
+    @abstractmethod
+    def prompt(self) -> str:
+        """
+        Return the question text, without the numbered options.
+        """
+        pass
+
+    def option_lines(self) -> List[str]:
+        return [f"{i}) {option}" for i, option in enumerate(self.options, start=1)]
+
+    def show_question(self):
+        print(f"\n— {self.title} —")
+        print(self.prompt())
+        for line in self.option_lines():
+            print(line)
+        print(f"Options: {', '.join(str(i) for i in range(1, len(self.options) + 1))}")
+
+    def _reveal(self) -> str:
+        return f"The answer is {self.correct_index + 1}) {self.options[self.correct_index]}."
+
+    def _artworks(self) -> Union[dict, Tuple[dict, ...]]:
+        return self.artwork.to_dict()
+
+    def ask_with_preset_answer(self, user_answer: str) -> Optional[Tuple[bool, int, Union[dict, Tuple[dict, ...]]]]:
+        if not user_answer.isdigit() or not 1 <= int(user_answer) <= len(self.options):
+            return None
+        is_correct = (int(user_answer) - 1 == self.correct_index)
+        print("Correct!" if is_correct else f"Wrong. {self._reveal()}")
+        return is_correct, int(is_correct), self._artworks()
+
+class GroupChoice(MultipleChoiceQuestion):
+    """
+    Question: Which group (movement, period, decade...) does this artwork belong to?
+    Uses the group index of `column`, so preparing is O(k) for k options.
+    """
+    column = ""
+    window: Optional[int] = None
+
+    def format_value(self, value) -> str:
+        return str(value)
+
+    def prepare_question(self, position: Optional[int] = None) -> bool:
+        index = self._get_index()
+        group = index.group(self.column)
+        if group is None or len(group) < 2 or not self._answers_vary(self.column):
+            return False
+        position = self._pick_position(position)
+        if position is None:
+            return False
+        code = int(group.codes[position])
+        codes = group.distractors(code, self.num_options - 1, self.window) + [code]
+        random.shuffle(codes)
+        self.artwork = self.index.row(position)
+        self.options = [self.format_value(group.values[c]) for c in codes]
+        self.correct_index = codes.index(code)
+        return True
+
+class MovementChoice(GroupChoice):
+    """
+    Question: Which art movement does this artwork belong to?
+    """
+    title = "Which Movement?"
+    column = "Category"
+    REQUIRED_COLUMNS = ["Category"]
+
+    def prompt(self) -> str:
+        return f"Which movement does the artwork '{self.artwork['Title']}' by {self.artwork['Artist']} belong to?"
+
+class StyleChoice(GroupChoice):
+    """
+    Question: Which period of art history is this artwork from?
+    """
+    title = "Which Period?"
+    column = "Style"
+    REQUIRED_COLUMNS = ["Style"]
+
+    def prompt(self) -> str:
+        return f"Which period is the artwork '{self.artwork['Title']}' by {self.artwork['Artist']} from?"
+
+class DecadeChoice(GroupChoice):
+    """
+    Question: In which decade was this artwork made? Options are neighbouring decades.
+    """
+    title = "Which Decade?"
+    column = "Year_decade"
+    REQUIRED_COLUMNS = ["Year_decade"]
+    window = 4
+
+    def format_value(self, value) -> str:
+        return f"{int(value)}s"
+
+    def prompt(self) -> str:
+        return f"In which decade was the artwork '{self.artwork['Title']}' by {self.artwork['Artist']} made?"
+
+class OddOneOut(MultipleChoiceQuestion):
+    """
+    Question: Which of these artworks does not belong to the same movement as the others?
+    """
+    title = "Odd One Out"
+    column = "Category"
+    REQUIRED_COLUMNS = ["Category"]
+
+    def prepare_question(self, position: Optional[int] = None) -> bool:
+        index = self._get_index()
+        group = index.group(self.column)
+        if group is None or len(group) < 2 or not self._answers_vary(self.column):
+            return False
+        odd_position = self._pick_position(position)
+        if odd_position is None:
+            return False
+        # Pick the shared group via a random row from another group; retries are rare unless one group dominates
+        pool = index.pool(self.REQUIRED_COLUMNS)
+        for _ in range(20):
+            anchor = index.random_position(pool)
+            if group.codes[anchor] != group.codes[odd_position]:
+                break
+        else:
+            return False
+        code = int(group.codes[anchor])
+        positions = group.random_members(code, self.num_options - 1, index.allows)
+        if not positions:
+            return False
+        self.correct_index = random.randrange(self.num_options)
+        positions.insert(self.correct_index, odd_position)
+        self.artworks = [self.index.row(p) for p in positions]
+        self.artwork = self.artworks[self.correct_index]
+        self.shared_value = group.values[code]
+        self.odd_value = group.values[group.codes[odd_position]]
+        self.options = [f"'{art['Title']}' by {art['Artist']}" for art in self.artworks]
+        return True
+
+    def prompt(self) -> str:
+        return "Which of these artworks does not belong to the same movement as the others?"
+
+    def _reveal(self) -> str:
+        return (f"The odd one out is {self.correct_index + 1}) ({self.odd_value}); "
+                f"the others are {self.shared_value}.")
+
+    def _artworks(self) -> Tuple[dict, ...]:
+        return tuple(art.to_dict() for art in self.artworks)
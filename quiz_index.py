@@ -0,0 +1,227 @@
+import random
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from bitmap_index import BitmapIndex, QuizFilter
+
+# Columns every question needs to show an artwork and its links
+BASE_COLUMNS = ["Title", "Artist", "Image URL", "Painting Info URL", "Artist Info URL"]
+# Hash identifying an artwork, added by the integrity pass in data_integrity.py
+KEY_COLUMN = "Artwork_key"
+# Columns with a group index built at load time
+GROUP_COLUMNS = ["Category", "Style", "Year_decade", "Year_exact", "Artist"]
+# Grouped columns whose comma-separated values are left out of their group index
+COMPOSITE_COLUMNS = {"Category", "Style"}
+
+
+class GroupedColumn:
+    """
+    Row positions grouped by the value of one column, restricted to rows with all base columns.
+    With skip_composite, values such as 'Cubism,Expressionism' are left out, as they make ambiguous answers.
+
+    Attributes:
+        values (list): Distinct values, in sorted order; a value's position in this list is its code.
+        codes (np.ndarray): Code per dataframe row, -1 where the row has no usable value.
+        rows (np.ndarray): Positions of all rows with a usable value.
+        members (list): Row positions per code.
+    """
+    def __init__(self, column: pd.Series, base_mask: np.ndarray, skip_composite: bool = False):
+        codes, uniques = pd.factorize(column, sort=True)
+        # Factorize first so only distinct values are checked, then renumber the kept ones
+        keep = np.array([not (skip_composite and isinstance(v, str) and "," in v) for v in uniques], dtype=bool)
+        remap = np.where(keep, np.cumsum(keep) - 1, -1).astype(np.int32)
+        codes = np.where(codes >= 0, remap[codes], -1)
+        codes[~base_mask] = -1
+        self.values: List = [v for v, k in zip(uniques, keep) if k]
+        self.codes: np.ndarray = codes.astype(np.int32)
+        self.rows: np.ndarray = np.flatnonzero(self.codes >= 0)
+        order = self.rows[np.argsort(self.codes[self.rows], kind="stable")]
+        bounds = np.cumsum(np.bincount(self.codes[self.rows], minlength=len(self.values)))
+        self.members: List[np.ndarray] = np.split(order, bounds[:-1]) if self.values else []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def random_members(self, code: int, count: int, allows: Optional[Callable[[int], bool]] = None) -> List[int]:
+        """
+        Returns `count` distinct random row positions from one group, or [] if there are not enough.
+        With `allows`, only rows it accepts are returned; draws are rejection-sampled with a bounded number of tries.
+        """
+        members = self.members[code]
+        if len(members) < count:
+            return []
+        if allows is None:
+            return [int(members[i]) for i in random.sample(range(len(members)), count)]
+        chosen = set()
+        for _ in range(20 * count):
+            position = int(members[random.randrange(len(members))])
+            if allows(position):
+                chosen.add(position)
+                if len(chosen) == count:
+                    return list(chosen)
+        return []
+
+    def distractors(self, code: int, count: int, window: Optional[int] = None) -> List[int]:
+        """
+        Returns up to `count` distinct codes other than `code`, in O(count) expected time.
+        With a window, codes are drawn from the `window` neighbours on either side of `code`
+        in sorted order, so e.g. decade options stay close to the answer.
+        """
+        low, high = 0, len(self.values)
+        if window is not None:
+            low, high = max(0, code - window), min(len(self.values), code + window + 1)
+        count = min(count, high - low - 1)
+        chosen = set()
+        while len(chosen) < count:
+            candidate = random.randrange(low, high)
+            if candidate != code:
+                chosen.add(candidate)
+        return list(chosen)
+
+
+class QuizIndex:
+    """
+    Indexes built once when data is loaded, so questions can be prepared without scanning the dataframe.
+    Also holds the active player filter and, per set of required columns, the eligible row positions.
+    """
+    def __init__(self, data: pd.DataFrame, group_columns: Sequence[str] = GROUP_COLUMNS):
+        self.data = data
+        present = [col for col in BASE_COLUMNS if col in data.columns]
+        if len(present) == len(BASE_COLUMNS):
+            self.base_mask = data[BASE_COLUMNS].notna().all(axis=1).to_numpy()
+        else:
+            self.base_mask = np.zeros(len(data), dtype=bool)
+        self.groups: Dict[str, GroupedColumn] = {
+            col: GroupedColumn(data[col], self.base_mask, col in COMPOSITE_COLUMNS)
+            for col in group_columns if col in data.columns
+        }
+        self.bitmaps = BitmapIndex(data)
+        self._column_bits: Dict[str, np.ndarray] = {}
+        self._pools: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._value_codes: Dict[str, Tuple[np.ndarray, list]] = {}
+        self._answer_counts: Dict[tuple, int] = {}
+        self._positions_by_key: Optional[Dict[int, int]] = None
+        self.filter = QuizFilter()
+        self.filter_bits = self.bitmaps.pack(self.base_mask)
+
+    def apply_filter(self, quiz_filter: QuizFilter) -> int:
+        """
+        Makes a filter active for all following questions and returns the number of matching playable rows.
+        Eligible pools are recomputed lazily per question type.
+
+        Raises:
+            ValueError: If the filter names a value that does not occur in the data.
+        """
+        bits = self.bitmaps.select(quiz_filter)
+        np.bitwise_and(bits, self.bitmaps.pack(self.base_mask), out=bits)
+        self.filter = quiz_filter
+        self.filter_bits = bits
+        self._pools.clear()
+        self._answer_counts.clear()
+        return int(np.unpackbits(bits, count=len(self.data)).sum())
+
+    def is_eligible(self, position: int, columns: Sequence[str]) -> bool:
+        """
+        Returns whether a row is in the pool for `columns`, without building the pool.
+        """
+        if not 0 <= position < len(self.data) or not self.allows(position):
+            return False
+        return all(BitmapIndex.contains(self._bits_for(column), position) for column in columns)
+
+    def position_of(self, key: int) -> Optional[int]:
+        """
+        Returns the row position of an Artwork_key, or None if the data has no such artwork.
+        """
+        if self._positions_by_key is None:
+            keys = self.data[KEY_COLUMN].tolist() if KEY_COLUMN in self.data.columns else []
+            self._positions_by_key = {key: position for position, key in enumerate(keys)}
+        return self._positions_by_key.get(key)
+
+    def key_at(self, position: int) -> Optional[int]:
+        """
+        Returns the Artwork_key of a row, or None if the data has no keys.
+        """
+        if KEY_COLUMN not in self.data.columns:
+            return None
+        return int(self.data[KEY_COLUMN].iat[position])
+
+    def allows(self, position: int) -> bool:
+        """
+        Returns whether a row is playable and matches the active filter.
+        """
+        return BitmapIndex.contains(self.filter_bits, position)
+
+    def _bits_for(self, column: str) -> np.ndarray:
+        bits = self._column_bits.get(column)
+        if bits is None:
+            if column in self.groups:
+                bits = self.bitmaps.pack(self.groups[column].codes >= 0)
+            elif column in self.data.columns:
+                bits = self.bitmaps.pack(self.data[column].notna().to_numpy())
+            else:
+                bits = self.bitmaps.pack(np.zeros(len(self.data), dtype=bool))
+            self._column_bits[column] = bits
+        return bits
+
+    def pool(self, columns: Sequence[str]) -> np.ndarray:
+        """
+        Returns the positions of rows matching the active filter that have usable values in `columns`.
+        Cached until the filter changes.
+        """
+        key = tuple(columns)
+        positions = self._pools.get(key)
+        if positions is None:
+            bits = self.filter_bits.copy()
+            for column in key:
+                np.bitwise_and(bits, self._bits_for(column), out=bits)
+            positions = self.bitmaps.positions(bits)
+            self._pools[key] = positions
+        return positions
+
+    def _codes_for(self, column: str) -> Tuple[np.ndarray, list]:
+        group = self.groups.get(column)
+        if group is not None:
+            return group.codes, group.values
+        codes = self._value_codes.get(column)
+        if codes is None:
+            values = self.data[column] if column in self.data.columns else pd.Series([None] * len(self.data))
+            factorized, uniques = pd.factorize(values)
+            codes = (factorized, list(uniques))
+            self._value_codes[column] = codes
+        return codes
+
+    def answer_count(self, columns: Sequence[str], column: str, answer_of: Optional[Callable] = None) -> int:
+        """
+        Returns how many different answers the rows in the pool for `columns` give, where a row's answer is
+        its value in `column`, mapped through `answer_of` if given. Cached until the filter changes.
+        """
+        key = (tuple(columns), column, answer_of)
+        count = self._answer_counts.get(key)
+        if count is None:
+            codes, values = self._codes_for(column)
+            pool_codes = codes[self.pool(columns)]
+            present = np.flatnonzero(np.bincount(pool_codes[pool_codes >= 0], minlength=len(values)))
+            count = len({values[c] if answer_of is None else answer_of(values[c]) for c in present})
+            self._answer_counts[key] = count
+        return count
+
+    @staticmethod
+    def random_position(pool: np.ndarray) -> Optional[int]:
+        """
+        Returns a random position from a pool, or None if it is empty.
+        """
+        if len(pool) == 0:
+            return None
+        return int(pool[random.randrange(len(pool))])
+
+    def group(self, column: str) -> Optional[GroupedColumn]:
+        """
+        Returns the group index for a column, or None if the column is not indexed.
+        """
+        return self.groups.get(column)
+
+    def row(self, position: int) -> pd.Series:
+        """
+        Returns the dataframe row at a position.
+        """
+        return self.data.iloc[position]
@@ -0,0 +1,209 @@
+import hashlib
+import heapq
+import math
+import re
+import unicodedata
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+
+# Intervals are counted in answered questions (the player's "step"), so reviews work the same
+# whether a player answers ten questions a day or a hundred.
+MISSED_INTERVAL = 3          # A missed item comes back after this many answers
+FIRST_CORRECT_INTERVAL = 40  # A fresh item answered correctly is checked again much later
+STARTING_EASE = 2.5          # Interval multiplier after a correct review
+MIN_EASE = 1.3
+MAX_EASE = 3.0
+UNAVAILABLE_DELAY = 25       # Due items that cannot be asked right now are retried after this many answers
+PASSED_DELAY = 5             # Items the player passed come back after this many answers
+
+STATE_DTYPE = np.dtype([
+    ("key", "<u8"),          # Artwork_key hash
+    ("qtype", "<u2"),        # Index into ReviewScheduler.type_names
+    ("due", "<i8"),          # Step at which the item is due
+    ("interval", "<i4"),
+    ("ease", "<f4"),
+    ("reps", "<u4"),         # Correct answers in a row
+    ("lapses", "<u4"),       # Total misses
+])
+
+
+def review_path(review_dir: Union[str, Path], player_name: str) -> Path:
+    """
+    Returns the state file for a player: the name reduced to safe filename characters for readability,
+    plus a short hash of the full name, so names that reduce alike (e.g. 'Zoë' and 'Zoé') get their own file.
+    """
+    name = unicodedata.normalize("NFC", player_name.strip())
+    safe_name = re.sub(r"[^a-z0-9_-]+", "_", name.lower()).strip("_") or "player"
+    digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+    return Path(review_dir) / f"{safe_name}-{digest}.npz"
+
+
+class ReviewScheduler:
+    """
+    Spaced-repetition state of one player for (artwork, question type) items.
+    State lives in a compact numpy table; a min-heap of (due step, slot) gives the next due item in O(log n).
+    Heap entries are invalidated lazily: an entry is stale when its due step no longer matches the table.
+    """
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self.step = 0
+        self.type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+        self.table = np.zeros(0, dtype=STATE_DTYPE)
+        self.size = 0
+        self._slots: Dict[Tuple[int, int], int] = {}
+        self._heap: List[Tuple[int, int]] = []
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ReviewScheduler":
+        """
+        Loads a player's state, or returns an empty scheduler if the file does not exist yet.
+
+        Raises:
+            ValueError: If the file is not a readable review state file (e.g. truncated or corrupt).
+        """
+        scheduler = cls(Path(path))
+        if not scheduler.path.exists():
+            return scheduler
+        try:
+            with np.load(scheduler.path, allow_pickle=False) as saved:
+                scheduler.step = int(saved["step"])
+                scheduler.type_names = [str(name) for name in saved["type_names"]]
+                table = saved["table"].astype(STATE_DTYPE)
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile) as exc:
+            raise ValueError(f"Could not read review state {scheduler.path}: {exc}")
+        scheduler._type_codes = {name: code for code, name in enumerate(scheduler.type_names)}
+        scheduler.table = table
+        scheduler.size = len(table)
+        keys = table["key"].tolist()
+        qtypes = table["qtype"].tolist()
+        scheduler._slots = {(k, q): slot for slot, (k, q) in enumerate(zip(keys, qtypes))}
+        scheduler._heap = list(zip(table["due"].tolist(), range(len(table))))
+        heapq.heapify(scheduler._heap)
+        return scheduler
+
+    def save(self):
+        """
+        Writes the state atomically to the scheduler's path.
+        """
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, step=np.int64(self.step), type_names=np.array(self.type_names, dtype=str),
+                 table=self.table[:self.size])
+        tmp_path.replace(self.path)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _type_code(self, type_name: str) -> int:
+        code = self._type_codes.get(type_name)
+        if code is None:
+            code = len(self.type_names)
+            self.type_names.append(type_name)
+            self._type_codes[type_name] = code
+        return code
+
+    def _slot_for(self, key: int, type_name: str) -> int:
+        item = (key, self._type_code(type_name))
+        slot = self._slots.get(item)
+        if slot is None:
+            if self.size == len(self.table):
+                grown = np.zeros(max(64, 2 * len(self.table)), dtype=STATE_DTYPE)
+                grown[:self.size] = self.table[:self.size]
+                self.table = grown
+            slot = self.size
+            self.size += 1
+            self.table[slot] = (key, item[1], 0, 0, STARTING_EASE, 0, 0)
+            self._slots[item] = slot
+        return slot
+
+    def _schedule(self, slot: int, due: int):
+        self.table["due"][slot] = due
+        heapq.heappush(self._heap, (due, slot))
+        # Rebuild when stale entries dominate, so the heap stays O(n) in size
+        if len(self._heap) > 2 * self.size + 64:
+            self._heap = list(zip(self.table["due"][:self.size].tolist(), range(self.size)))
+            heapq.heapify(self._heap)
+
+    def is_waiting(self, key: int, type_name: str) -> bool:
+        """
+        Returns whether an item is tracked and not due yet.
+        """
+        slot = self._slots.get((int(key), self._type_codes.get(type_name, -1)))
+        return slot is not None and self.table["due"][slot] > self.step
+
+    def advance(self):
+        """
+        Advances the player's step for an answer that does not update any item.
+        """
+        self.step += 1
+
+    def record(self, key: int, type_name: str, correct: bool):
+        """
+        Updates an item after the player answered it and advances the player's step.
+        """
+        self.step += 1
+        slot = self._slot_for(int(key), type_name)
+        _, _, _, interval, ease, reps, lapses = self.table[slot].tolist()
+        if correct:
+            if reps == 0 and lapses == 0:
+                interval = FIRST_CORRECT_INTERVAL
+            elif reps == 0:
+                interval = MISSED_INTERVAL * 2
+            else:
+                interval = math.ceil(interval * ease)
+            ease = min(MAX_EASE, ease + 0.05)
+            reps += 1
+        else:
+            interval = MISSED_INTERVAL
+            ease = max(MIN_EASE, ease - 0.2)
+            reps = 0
+            lapses += 1
+        self.table[slot] = (key, self.table["qtype"][slot], self.table["due"][slot], interval, ease, reps, lapses)
+        self._schedule(slot, self.step + interval)
+
+    def defer(self, key: int, type_name: str, delay: int = UNAVAILABLE_DELAY):
+        """
+        Pushes a tracked item back, e.g. when its question could not be prepared or was passed.
+        Items already due later than `delay` answers from now are left alone.
+        """
+        slot = self._slots.get((int(key), self._type_codes.get(type_name, -1)))
+        if slot is not None and self.table["due"][slot] < self.step + delay:
+            self._schedule(slot, self.step + delay)
+
+    def next_due(self, available: Optional[Callable[[int, str], bool]] = None,
+                 max_checks: int = 32) -> Optional[Tuple[int, str]]:
+        """
+        Returns the most overdue (artwork key, question type name) item, or None if nothing is due.
+        The item stays scheduled until it is recorded. Items `available` rejects are deferred;
+        at most `max_checks` of them are looked at per call.
+        """
+        due_column = self.table["due"]
+        checks = 0
+        while self._heap:
+            due, slot = self._heap[0]
+            if due_column[slot] != due:
+                heapq.heappop(self._heap)  # Stale entry, the item was rescheduled
+                continue
+            if due > self.step:
+                return None
+            key = int(self.table["key"][slot])
+            type_name = self.type_names[self.table["qtype"][slot]]
+            if available is None or available(key, type_name):
+                return key, type_name
+            heapq.heappop(self._heap)
+            self._schedule(slot, self.step + UNAVAILABLE_DELAY)
+            checks += 1
+            if checks >= max_checks:
+                return None
+        return None
+
+    def due_count(self) -> int:
+        """
+        Returns how many items are due now (O(n), for display only).
+        """
+        return int((self.table["due"][:self.size] <= self.step).sum())
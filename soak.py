@@ -0,0 +1,242 @@
+import argparse
+import contextlib
+import gc
+import os
+import random
+import sys
+import tempfile
+import tkinter as tk
+import tracemalloc
+from pathlib import Path
+
+from data_loader import load_artwork_data
+from event_log import AnswerEventLog, OUTCOME_PASSED, OUTCOME_QUIT
+from game import ArtQuizGame, MAX_CONSECUTIVE_PASSES, QUESTION_CLASSES
+from gui import ArtQuizGUI  # Also attaches the GUI engine calls (play_round_gui, check_answer_gui) to ArtQuizGame
+from questions import MultipleChoiceQuestion, OldestArtworkCheck
+
+PASS_RATE = 0.08        # Share of rounds the auto-clicker passes
+QUIT_RATE = 0.005       # Share of rounds it quits (and restarts)
+INVALID_RATE = 0.03     # Share of rounds it first presses a button that does not fit the question
+
+
+def rss_bytes() -> int:
+    """
+    Returns the current resident set size of this process (peak RSS where the current value is unavailable).
+    """
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+                )
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return counters.WorkingSetSize
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _answers_for(question) -> list:
+    if isinstance(question, MultipleChoiceQuestion):
+        return [str(i) for i in range(1, len(question.options) + 1)]
+    if isinstance(question, OldestArtworkCheck):
+        return ["1", "2", "s"]
+    return ["yes", "no"]
+
+
+class GuiDriver:
+    """
+    Auto-clicker for ArtQuizGUI: invokes the same buttons a player would, so all callbacks run as in play.
+    """
+    def __init__(self, root, gui, rng: random.Random):
+        self.root = root
+        self.gui = gui
+        self.rng = rng
+        self.buttons = {
+            "yes": gui.btn_yes, "no": gui.btn_no, "1": gui.btn_1, "2": gui.btn_2,
+            "3": gui.btn_3, "4": gui.btn_4, "s": gui.btn_same,
+        }
+        self.steps = 0
+
+    def step(self) -> bool:
+        """
+        Performs one click. Returns True if it answered, passed or quit a question.
+        """
+        gui = self.gui
+        self.steps += 1
+        if self.steps % 50 == 0:
+            self.root.update()
+        if gui.restart_button.winfo_manager():
+            gui.restart_button.invoke()
+            return False
+        if gui.awaiting_answer:
+            roll = self.rng.random()
+            if roll < QUIT_RATE:
+                gui.btn_quit.invoke()
+                return True
+            if roll < QUIT_RATE + PASS_RATE and str(gui.btn_pass["state"]) == "normal":
+                gui.btn_pass.invoke()
+                return True
+            valid = _answers_for(gui.game.current_question)
+            if roll > 1 - INVALID_RATE:
+                invalid = [a for a in self.buttons if a not in valid]
+                self.buttons[self.rng.choice(invalid)].invoke()
+            self.buttons[self.rng.choice(valid)].invoke()
+            return True
+        if str(gui.next_button["state"]) == "normal":
+            gui.next_button.invoke()
+        else:
+            gui.next_question()
+        return False
+
+
+class EngineDriver:
+    """
+    Drives ArtQuizGame through the GUI-facing engine calls (play_round_gui/check_answer_gui) without Tk.
+    """
+    def __init__(self, game: ArtQuizGame, player_name: str, rng: random.Random):
+        self.game = game
+        self.player_name = player_name
+        self.rng = rng
+        game.open_reviews(player_name)
+
+    def _restart(self):
+        game = self.game
+        game.save_reviews()
+        game.__init__(game.data, game.event_log, game.index, game.review_dir)
+        game.open_reviews(self.player_name)
+
+    def step(self) -> bool:
+        game = self.game
+        keep_playing, _, _, _ = game.play_round_gui()
+        if not keep_playing or game.lives <= 0:
+            self._restart()
+            return False
+        question = game.current_question
+        roll = self.rng.random()
+        if roll < QUIT_RATE:
+            game.record_event(question, OUTCOME_QUIT)
+            self._restart()
+        elif roll < QUIT_RATE + PASS_RATE and game.consecutive_passes < MAX_CONSECUTIVE_PASSES:
+            game.record_event(question, OUTCOME_PASSED)
+            game.defer_review(question)
+            game.consecutive_passes += 1
+        else:
+            if roll > 1 - INVALID_RATE:
+                game.check_answer_gui("maybe")
+            game.check_answer_gui(self.rng.choice(_answers_for(question)))
+            game.consecutive_passes = 0
+            if game.lives <= 0:
+                self._restart()
+        return True
+
+
+def run_soak(driver, rounds: int, warmup: int, sample_every: int, max_rss_growth_mb: float,
+             max_traced_growth_mb: float, trace_frames: int) -> bool:
+    """
+    Runs the driver for warmup + rounds questions, sampling RSS and tracemalloc.
+    Returns True if memory growth after warmup stayed under both thresholds.
+    """
+    def run(count: int):
+        done = 0
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            while done < count:
+                done += driver.step()
+
+    tracemalloc.start(trace_frames)
+    run(warmup)
+    gc.collect()
+    base_rss = rss_bytes()
+    base_traced = tracemalloc.get_traced_memory()[0]
+    base_snapshot = tracemalloc.take_snapshot()
+    print(f"after {warmup} warm-up rounds: RSS {base_rss / 2**20:.1f} MB, traced {base_traced / 2**20:.1f} MB")
+
+    rss, traced = base_rss, base_traced
+    done = 0
+    while done < rounds:
+        chunk = min(sample_every, rounds - done)
+        run(chunk)
+        done += chunk
+        gc.collect()
+        rss = rss_bytes()
+        traced = tracemalloc.get_traced_memory()[0]
+        print(f"round {done:>7}: RSS {rss / 2**20:8.1f} MB ({(rss - base_rss) / 2**20:+.1f}), "
+              f"traced {traced / 2**20:7.1f} MB ({(traced - base_traced) / 2**20:+.2f})")
+
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    print("\nLargest allocation growth since warm-up:")
+    for stat in snapshot.compare_to(base_snapshot, "lineno")[:10]:
+        print(f"  {stat}")
+
+    rss_growth = (rss - base_rss) / 2**20
+    traced_growth = (traced - base_traced) / 2**20
+    ok = rss_growth <= max_rss_growth_mb and traced_growth <= max_traced_growth_mb
+    print(f"\nRSS growth {rss_growth:+.1f} MB (limit {max_rss_growth_mb}), "
+          f"traced growth {traced_growth:+.2f} MB (limit {max_traced_growth_mb}): {'PASS' if ok else 'FAIL'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-session soak test with memory-growth detection.")
+    parser.add_argument("--rounds", type=int, default=20_000, help="Questions to play after warm-up")
+    parser.add_argument("--warmup", type=int, default=1_000, help="Questions played before the memory baseline")
+    parser.add_argument("--sample-every", type=int, default=1_000, help="Questions between memory samples")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=64.0)
+    parser.add_argument("--max-traced-growth-mb", type=float, default=16.0)
+    parser.add_argument("--trace-frames", type=int, default=1, help="Stack frames kept per tracemalloc allocation")
+    parser.add_argument("--no-gui", action="store_true", help="Drive the engine only, without Tk")
+    parser.add_argument("--no-reviews", action="store_true",
+                        help="Disable spaced repetition, whose state grows with every new item answered")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        data = load_artwork_data(Path("clean_quiz_core_metadata.tsv"), Path("WikiArt-info.tsv"),
+                                 [cls.REQUIRED_COLUMNS for cls in QUESTION_CLASSES])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        event_log = AnswerEventLog(Path(tmp) / "answer_events.log")
+        review_dir = None if args.no_reviews else Path(tmp) / "reviews"
+        game = ArtQuizGame(data, event_log, review_dir=review_dir)
+        root = None
+        if args.no_gui:
+            driver = EngineDriver(game, "soak", rng)
+        else:
+            try:
+                root = tk.Tk()
+            except tk.TclError as exc:
+                print(f"Cannot open a display ({exc}). Use --no-gui, or run under a virtual display such as xvfb-run.")
+                sys.exit(2)
+            root.withdraw()
+            driver = GuiDriver(root, ArtQuizGUI(root, game, player_name="soak"), rng)
+
+        try:
+            ok = run_soak(driver, args.rounds, args.warmup, args.sample_every,
+                          args.max_rss_growth_mb, args.max_traced_growth_mb, args.trace_frames)
+        finally:
+            game.save_reviews()
+            event_log.close()
+            if root is not None:
+                root.destroy()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()